@@ -0,0 +1,86 @@
+"""Micro-benchmark for MQTT payload decoding.
+
+Compares the previous decode path (``bytes.decode()`` then ``json.loads``)
+with ``api.codec.loads`` on a typical THSensor report.
+
+Run from the repository root:
+
+    python benchmarks/bench_codec.py
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "custom_components" / "yolocal")
+)
+
+from api import codec  # noqa: E402
+
+PAYLOAD = json.dumps(
+    {
+        "event": "THSensor.Report",
+        "time": 1734567890123,
+        "msgid": "1734567890123",
+        "data": {
+            "state": "normal",
+            "alarm": {
+                "lowBattery": False,
+                "lowTemp": False,
+                "highTemp": False,
+                "lowHumidity": False,
+                "highHumidity": False,
+                "period": False,
+                "code": 0,
+            },
+            "battery": 4,
+            "mode": "f",
+            "interval": 0,
+            "temperature": 21.4,
+            "humidity": 43.2,
+            "tempLimit": {"max": 40, "min": -20},
+            "humidityLimit": {"max": 100, "min": 0},
+            "tempCorrection": 0,
+            "humidityCorrection": 0,
+            "version": "0382",
+            "loraInfo": {
+                "netId": "010201",
+                "signal": -62,
+                "gatewayId": "abc",
+                "gateways": 1,
+            },
+        },
+        "deviceId": "d88b4c0100000001",
+    }
+).encode()
+
+
+def bench(label: str, func, number: int) -> float:
+    """Time ``func`` and print the per-call cost in microseconds."""
+    elapsed = min(timeit.repeat(func, number=number, repeat=5))
+    per_call = elapsed / number * 1e6
+    print(f"{label:<28} {per_call:8.2f} us/msg")
+    return per_call
+
+
+def main() -> None:
+    """Run the benchmark."""
+    number = 50000
+    view = memoryview(PAYLOAD)
+    print(f"codec backend: {codec.BACKEND}, payload {len(PAYLOAD)} bytes")
+    baseline = bench(
+        "json.loads(bytes.decode())", lambda: json.loads(PAYLOAD.decode()), number
+    )
+    current = bench("codec.loads(bytes)", lambda: codec.loads(PAYLOAD), number)
+    bench("codec.loads(memoryview)", lambda: codec.loads(view), number)
+    print(f"saving: {baseline - current:.2f} us/msg ({baseline / current:.2f}x)")
+    if codec.BACKEND != "orjson":
+        print("note: without orjson the codec is the standard library; no gain")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""End-to-end benchmarks against the local stand-in hub.
+
+Reports, for a synthetic fleet:
+
+- ``client``: startup time (token, device list and a bounded getState
+  fan-out) and setState round-trip time through ``YoLinkClient``, both
+  idle and while a background getState sweep is running
+- ``mqtt``: publish-to-callback latency through ``YoLinkMQTTClient``
+- ``coordinator``: startup time, publish-to-entity-listener latency and
+  memory per device for ``YoLocalCoordinator`` (needs Home Assistant
+  installed; skipped otherwise)
+
+Run from the repository root, for example:
+
+    python benchmarks/bench_e2e.py --devices 2000 --latency 0.005 --rate 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "custom_components" / "yolocal"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api import Priority, TokenManager, YoLinkClient, YoLinkMQTTClient  # noqa: E402
+from fake_hub import CLIENT_ID, CLIENT_SECRET, NET_ID, FakeHub  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return latency percentiles in milliseconds."""
+    if not samples:
+        return {}
+    ms = sorted(s * 1000 for s in samples)
+    if len(ms) == 1:
+        return {"n": 1, "p50": ms[0], "p95": ms[0], "p99": ms[0], "max": ms[0]}
+    quantiles = statistics.quantiles(ms, n=100)
+    return {
+        "n": len(ms),
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+        "max": ms[-1],
+    }
+
+
+def report(name: str, value: Any) -> None:
+    """Print one result line."""
+    if isinstance(value, dict):
+        value = "  ".join(
+            f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+            for k, v in value.items()
+        )
+    elif isinstance(value, float):
+        value = f"{value:.3f}"
+    print(f"  {name:<24} {value}")
+
+
+async def publish_and_measure(
+    hub: FakeHub,
+    count: int,
+    rate: float,
+    received: dict[str, float],
+) -> list[float]:
+    """Publish ``count`` reports at ``rate``/s and collect delivery latencies.
+
+    ``received`` is filled by the caller's callback with the time each
+    device's update was observed. With coalescing, only the latest report
+    per device is measured, and reports that do not notify listeners
+    (unchanged, throttled or deduplicated) are not measured at all.
+    """
+    devices = list(hub.devices.values())
+    sent: dict[str, float] = {}
+    latencies: list[float] = []
+    interval = 1 / rate
+    next_at = time.perf_counter()
+    for index in range(count):
+        device = devices[index % len(devices)]
+        hub.mutate(device)
+        sent[device.device_id] = time.perf_counter()
+        received.pop(device.device_id, None)
+        hub.publish_report(device)
+        next_at += interval
+        await asyncio.sleep(max(0, next_at - time.perf_counter()))
+    await asyncio.sleep(0.5)
+    for device_id, sent_at in sent.items():
+        if device_id in received:
+            latencies.append(received[device_id] - sent_at)
+    return latencies
+
+
+async def bench_client(hub: FakeHub, args: argparse.Namespace) -> dict[str, Any]:
+    """Measure startup and command round trips through YoLinkClient."""
+    async with aiohttp.ClientSession() as session:
+        token_manager = TokenManager(
+            HOST, CLIENT_ID, CLIENT_SECRET, session, hub.http_port
+        )
+        client = YoLinkClient(HOST, token_manager, session, hub.http_port)
+
+        started = time.perf_counter()
+        await token_manager.get_token()
+        devices = await client.get_devices()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def fetch(device: Any) -> None:
+            async with semaphore:
+                await client.get_state(device)
+
+        await asyncio.gather(*(fetch(device) for device in devices))
+        startup = time.perf_counter() - started
+
+        outlets = [d for d in devices if d.device_type == "Outlet"]
+
+        async def commands() -> list[float]:
+            round_trips = []
+            for index in range(args.commands):
+                device = outlets[index % len(outlets)]
+                sent_at = time.perf_counter()
+                await client.set_state(
+                    device, {"state": "open" if index % 2 else "closed"}
+                )
+                round_trips.append(time.perf_counter() - sent_at)
+            return round_trips
+
+        idle = await commands()
+        # Queue the whole fleet at once, as a refresh sweep would
+        sweep = asyncio.gather(
+            *(client.get_state(d, Priority.BACKGROUND) for d in devices),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        busy = await commands()
+        client.cancel_background()
+        await sweep
+
+    return {
+        "startup_s": startup,
+        "command_rtt_ms": summarize(idle),
+        "command_rtt_sweep_ms": summarize(busy),
+    }
+
+
+async def bench_mqtt(hub: FakeHub, args: argparse.Namespace) -> dict[str, Any]:
+    """Measure publish-to-callback latency through YoLinkMQTTClient."""
+    received: dict[str, float] = {}
+    client = YoLinkMQTTClient(
+        HOST,
+        NET_ID,
+        CLIENT_ID,
+        "unused",
+        port=hub.broker.port,
+        transport=args.transport,
+    )
+    client.subscribe(
+        lambda event: received.__setitem__(event.device_id, time.perf_counter())
+    )
+    await client.connect()
+    try:
+        latencies = await publish_and_measure(hub, args.events, args.rate, received)
+    finally:
+        await client.disconnect()
+    return {"event_latency_ms": summarize(latencies)}
+
+
+async def bench_coordinator(hub: FakeHub, args: argparse.Namespace) -> dict[str, Any]:
+    """Measure startup, event latency and memory for YoLocalCoordinator."""
+    sys.path.insert(0, str(ROOT))
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.yolocal.coordinator import create_coordinator
+
+    async def create(hass: HomeAssistant) -> Any:
+        return await create_coordinator(
+            hass,
+            HOST,
+            CLIENT_ID,
+            CLIENT_SECRET,
+            NET_ID,
+            http_port=hub.http_port,
+            mqtt_port=hub.broker.port,
+            setup_concurrency=args.concurrency,
+            mqtt_transport=args.transport,
+        )
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        started = time.perf_counter()
+        coordinator = await create(hass)
+        startup = time.perf_counter() - started
+
+        received: dict[str, float] = {}
+        for device_id in coordinator.devices:
+            coordinator.async_add_device_listener(
+                device_id,
+                lambda device_id=device_id: received.__setitem__(
+                    device_id, time.perf_counter()
+                ),
+            )
+        try:
+            latencies = await publish_and_measure(
+                hub, args.events, args.rate, received
+            )
+        finally:
+            await coordinator.async_shutdown()
+        counters = coordinator.metrics.counters
+        # Latency covers only the devices whose listeners were notified
+        coverage = {
+            "reports": args.events,
+            "devices_reported": min(args.events, len(hub.devices)),
+            "devices_measured": len(latencies),
+            "throttled": counters.get("updates_suppressed", 0)
+            + counters.get("updates_deferred", 0),
+            "deduplicated": counters.get("events_duplicate", 0)
+            + counters.get("events_out_of_order", 0),
+        }
+        # The rest reported a state identical to the cached one
+        coverage["unchanged"] = max(
+            0,
+            coverage["devices_reported"]
+            - coverage["devices_measured"]
+            - coverage["throttled"]
+            - coverage["deduplicated"],
+        )
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        coordinator = await create(hass)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        await coordinator.async_shutdown()
+
+    return {
+        "startup_s": startup,
+        "event_latency_ms": summarize(latencies),
+        "event_coverage": coverage,
+        "bytes_per_device": used / len(hub.devices),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the selected benchmarks against a fresh stand-in hub."""
+    hub = FakeHub(
+        device_count=args.devices,
+        latency=args.latency,
+        max_concurrency=args.hub_concurrency,
+    )
+    await hub.start()
+    results: dict[str, Any] = {
+        "devices": args.devices,
+        "latency_s": args.latency,
+        "transport": args.transport,
+    }
+    print(
+        f"{args.devices} devices, {args.latency * 1000:.1f} ms hub latency, "
+        f"{args.transport} transport"
+    )
+    try:
+        for name, bench in (
+            ("client", bench_client),
+            ("mqtt", bench_mqtt),
+            ("coordinator", bench_coordinator),
+        ):
+            if args.only and name not in args.only:
+                continue
+            try:
+                result = await bench(hub, args)
+            except ImportError as err:
+                print(f"{name}: skipped ({err})")
+                continue
+            print(f"{name}:")
+            for key, value in result.items():
+                report(key, value)
+            results[name] = result
+        results["hub_max_in_flight"] = hub.max_in_flight
+        print(f"hub: max {hub.max_in_flight} requests in flight")
+    finally:
+        await hub.stop()
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description="YoLink Local end-to-end benchmarks")
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds")
+    parser.add_argument("--hub-concurrency", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500, help="events per second")
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--transport", default="thread", choices=("thread", "asyncio"))
+    parser.add_argument(
+        "--only", action="append", choices=("client", "mqtt", "coordinator")
+    )
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Memory benchmark for the per-device caches.
+
+Builds the device list and cached states for a synthetic fleet the way the
+coordinator does, from hub-shaped JSON, and reports the bytes retained per
+1000 devices. ``previous`` keeps decoded payloads as they are, as the
+coordinator used to; ``current`` uses ``Device.from_api`` and
+``normalize_state``.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py --devices 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import gc
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+from typing import Any
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "custom_components" / "yolocal")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api import Device  # noqa: E402
+from api.state import normalize_state  # noqa: E402
+from fake_hub import make_devices  # noqa: E402
+
+
+@dataclass
+class PlainDevice:
+    """The previous, unslotted device record."""
+
+    device_id: str
+    name: str
+    token: str
+    device_type: str
+
+
+def hub_payloads(count: int) -> list[tuple[bytes, bytes]]:
+    """Return encoded device-list entries and getState results."""
+    payloads = []
+    for index, device in enumerate(make_devices(count)):
+        state = device.get_state()
+        # Real hubs attach radio metadata to every state
+        state["loraInfo"] = {
+            "netId": "010201",
+            "signal": -60 - index % 30,
+            "gatewayId": "d88b4c1603000000",
+            "gateways": 1,
+        }
+        payloads.append(
+            (json.dumps(device.as_api()).encode(), json.dumps(state).encode())
+        )
+    return payloads
+
+
+def measure(payloads: list[tuple[bytes, bytes]], compact: bool) -> int:
+    """Return the bytes retained by the device and state caches."""
+    gc.collect()
+    tracemalloc.start()
+    devices: dict[str, Any] = {}
+    states: dict[str, dict[str, Any]] = {}
+    for listing, state in payloads:
+        data = json.loads(listing)
+        if compact:
+            device: Any = Device.from_api(data)
+            states[device.device_id] = normalize_state(json.loads(state))
+        else:
+            device = PlainDevice(
+                data["deviceId"], data["name"], data["token"], data["type"]
+            )
+            states[device.device_id] = json.loads(state)
+        devices[device.device_id] = device
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del devices, states
+    return used
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Per-device memory benchmark")
+    parser.add_argument("--devices", type=int, default=5000)
+    args = parser.parse_args()
+
+    payloads = hub_payloads(args.devices)
+    per_k = 1000 / args.devices
+    previous = measure(payloads, compact=False) * per_k
+    current = measure(payloads, compact=True) * per_k
+    print(f"{args.devices} devices")
+    print(f"  previous   {previous / 1024:8.1f} KiB per 1k devices")
+    print(f"  current    {current / 1024:8.1f} KiB per 1k devices")
+    print(f"  saving     {(1 - current / previous) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
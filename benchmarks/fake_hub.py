@@ -0,0 +1,430 @@
+"""Local stand-in for a YoLink Local Hub (HTTP API + MQTT report stream).
+
+Emulates ``/open/yolink/token``, ``/open/yolink/v2/api``
+(``Home.getDeviceList``, ``*.getState``, ``*.setState``) and a minimal
+MQTT 3.1.1 broker that publishes ``ylsubnet/<net_id>/<deviceId>/report``
+messages. Thousands of synthetic devices, per-request latency and a
+steady event rate are all configurable.
+
+Used by ``bench_e2e.py``; it can also be run on its own to point a real
+Home Assistant instance at:
+
+    python benchmarks/fake_hub.py --devices 2000 --rate 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import json
+import random
+import struct
+import time
+from typing import Any
+
+from aiohttp import web
+
+CLIENT_ID = "bench-client"
+CLIENT_SECRET = "bench-secret"
+NET_ID = "benchnet"
+
+# Relative share of each device type in the synthetic fleet
+DEVICE_MIX = {
+    "THSensor": 5,
+    "DoorSensor": 3,
+    "LeakSensor": 2,
+    "Outlet": 2,
+    "Lock": 1,
+    "Siren": 1,
+}
+
+# Device types whose getState result nests readings under "state"
+NESTED_STATE_TYPES = {"THSensor", "DoorSensor", "LeakSensor"}
+
+
+@dataclass
+class FakeDevice:
+    """A synthetic device and its current state."""
+
+    device_id: str
+    name: str
+    device_type: str
+    token: str
+    state: dict[str, Any] = field(default_factory=dict)
+
+    def as_api(self) -> dict[str, Any]:
+        """Return the device as listed by ``Home.getDeviceList``."""
+        return {
+            "deviceId": self.device_id,
+            "name": self.name,
+            "token": self.token,
+            "type": self.device_type,
+        }
+
+    def get_state(self) -> dict[str, Any]:
+        """Return the ``getState`` response data."""
+        if self.device_type in NESTED_STATE_TYPES:
+            return {
+                "online": True,
+                "state": dict(self.state),
+                "deviceId": self.device_id,
+            }
+        return {"online": True, **self.state, "deviceId": self.device_id}
+
+
+def make_devices(count: int, seed: int = 0) -> list[FakeDevice]:
+    """Create a deterministic fleet of synthetic devices."""
+    rng = random.Random(seed)
+    types = [t for t, weight in DEVICE_MIX.items() for _ in range(weight)]
+    devices = []
+    for index in range(count):
+        device_type = types[index % len(types)]
+        devices.append(
+            FakeDevice(
+                device_id=f"d88b4c01{index:08x}",
+                name=f"{device_type} {index}",
+                device_type=device_type,
+                token=f"tok{index:08x}",
+                state=_initial_state(device_type, rng),
+            )
+        )
+    return devices
+
+
+def _initial_state(device_type: str, rng: random.Random) -> dict[str, Any]:
+    """Return a plausible starting state for a device type."""
+    if device_type == "THSensor":
+        return {
+            "state": "normal",
+            "battery": 4,
+            "temperature": round(rng.uniform(18, 24), 1),
+            "humidity": round(rng.uniform(30, 60), 1),
+        }
+    if device_type == "DoorSensor":
+        return {"state": "closed", "battery": 4}
+    if device_type == "LeakSensor":
+        return {"state": "normal", "battery": 4}
+    if device_type == "Outlet":
+        return {"state": "closed"}
+    if device_type == "Lock":
+        return {"state": "locked", "battery": 4}
+    return {"state": "normal"}
+
+
+class FakeBroker:
+    """Just enough of an MQTT 3.1.1 broker for QoS 0 report delivery."""
+
+    def __init__(self) -> None:
+        """Initialize the broker."""
+        self._subscribers: list[asyncio.StreamWriter] = []
+        self._server: asyncio.Server | None = None
+        self.port = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of subscribed clients."""
+        return len(self._subscribers)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Disconnect all clients and stop listening."""
+        for writer in list(self._subscribers):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """Close every client connection, simulating a broker restart."""
+        for writer in list(self._subscribers):
+            writer.close()
+
+    def publish(self, topic: str, payload: bytes) -> None:
+        """Send a QoS 0 PUBLISH to every subscriber."""
+        encoded = topic.encode()
+        body = struct.pack("!H", len(encoded)) + encoded + payload
+        packet = b"\x30" + _encode_length(len(body)) + body
+        for writer in self._subscribers:
+            writer.write(packet)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        try:
+            while True:
+                header = (await reader.readexactly(1))[0]
+                length = await _read_length(reader)
+                body = await reader.readexactly(length)
+                packet_type = header >> 4
+                if packet_type == 1:  # CONNECT
+                    writer.write(b"\x20\x02\x00\x00")
+                elif packet_type == 8:  # SUBSCRIBE
+                    writer.write(b"\x90\x03" + body[:2] + b"\x00")
+                    self._subscribers.append(writer)
+                elif packet_type == 12:  # PINGREQ
+                    writer.write(b"\xd0\x00")
+                elif packet_type == 14:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if writer in self._subscribers:
+                self._subscribers.remove(writer)
+            writer.close()
+
+
+def _encode_length(length: int) -> bytes:
+    """Encode an MQTT remaining-length field."""
+    out = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        out.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(out)
+
+
+async def _read_length(reader: asyncio.StreamReader) -> int:
+    """Decode an MQTT remaining-length field."""
+    multiplier, length = 1, 0
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        length += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        if not byte & 0x80:
+            return length
+
+
+class FakeHub:
+    """HTTP API and MQTT broker emulating a YoLink Local Hub."""
+
+    def __init__(
+        self,
+        device_count: int = 100,
+        latency: float = 0.0,
+        max_concurrency: int | None = None,
+        report_delay: float = 0.05,
+        token_lifetime: int = 7200,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the hub.
+
+        ``latency`` is added to every HTTP request. ``max_concurrency``
+        limits how many requests the hub serves at once, like the embedded
+        hub does. ``report_delay`` is how long after a setState the device's
+        MQTT report is published.
+        """
+        self.devices = {d.device_id: d for d in make_devices(device_count, seed)}
+        self.latency = latency
+        self.report_delay = report_delay
+        self.token_lifetime = token_lifetime
+        self.broker = FakeBroker()
+        self.http_port = 0
+        self.token_requests = 0
+        self.api_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._tokens: set[str] = set()
+        self._runner: web.AppRunner | None = None
+        self._msgids = itertools.count(1)
+        self._event_task: asyncio.Task[None] | None = None
+        self._rng = random.Random(seed)
+
+    async def start(
+        self, host: str = "127.0.0.1", http_port: int = 0, mqtt_port: int = 0
+    ) -> None:
+        """Start the HTTP server and MQTT broker (port 0 picks a free port)."""
+        app = web.Application()
+        app.router.add_post("/open/yolink/token", self._handle_token)
+        app.router.add_post("/open/yolink/v2/api", self._handle_api)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, http_port)
+        await site.start()
+        server = site._server
+        self.http_port = server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        await self.broker.start(host, mqtt_port)
+
+    async def stop(self) -> None:
+        """Stop everything."""
+        self.stop_events()
+        await self.broker.stop()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def revoke_tokens(self) -> None:
+        """Invalidate all issued tokens, as a hub restart does."""
+        self._tokens.clear()
+
+    def publish_report(self, device: FakeDevice, event: str = "Report") -> str:
+        """Publish the current state of a device as an MQTT report."""
+        msgid = str(next(self._msgids))
+        payload = {
+            "event": f"{device.device_type}.{event}",
+            "time": int(time.time() * 1000),
+            "msgid": msgid,
+            "data": dict(device.state),
+            "deviceId": device.device_id,
+        }
+        self.broker.publish(
+            f"ylsubnet/{NET_ID}/{device.device_id}/report",
+            json.dumps(payload).encode(),
+        )
+        return msgid
+
+    def mutate(self, device: FakeDevice) -> None:
+        """Apply a random, plausible change to a device's state."""
+        state = device.state
+        if device.device_type == "THSensor":
+            temperature = state["temperature"] + self._rng.uniform(-0.3, 0.3)
+            state["temperature"] = round(temperature, 1)
+            humidity = state["humidity"] + self._rng.uniform(-1, 1)
+            state["humidity"] = round(humidity, 1)
+        elif device.device_type == "DoorSensor":
+            state["state"] = "open" if state["state"] == "closed" else "closed"
+        elif device.device_type == "LeakSensor":
+            state["state"] = "alert" if state["state"] == "normal" else "normal"
+
+    def start_events(self, rate: float) -> None:
+        """Publish reports from random devices at ``rate`` events per second."""
+        self.stop_events()
+        self._event_task = asyncio.create_task(self._event_loop(rate))
+
+    def stop_events(self) -> None:
+        """Stop the background event stream."""
+        if self._event_task:
+            self._event_task.cancel()
+            self._event_task = None
+
+    async def _event_loop(self, rate: float) -> None:
+        """Generate reports at a steady rate."""
+        devices = list(self.devices.values())
+        interval = 1 / rate
+        next_at = time.monotonic()
+        while True:
+            device = self._rng.choice(devices)
+            self.mutate(device)
+            self.publish_report(device)
+            next_at += interval
+            await asyncio.sleep(max(0, next_at - time.monotonic()))
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue an access token for valid client credentials."""
+        self.token_requests += 1
+        form = await request.post()
+        if (
+            form.get("client_id") != CLIENT_ID
+            or form.get("client_secret") != CLIENT_SECRET
+        ):
+            return web.json_response({"code": "010104", "desc": "Invalid client"})
+        token = f"token-{self.token_requests}"
+        self._tokens.add(token)
+        return web.json_response(
+            {
+                "access_token": token,
+                "token_type": "bearer",
+                "expires_in": self.token_lifetime,
+            }
+        )
+
+    async def _handle_api(self, request: web.Request) -> web.Response:
+        """Serve a v2 API call."""
+        self.api_requests += 1
+        if self._limit:
+            async with self._limit:
+                return await self._serve_api(request)
+        return await self._serve_api(request)
+
+    async def _serve_api(self, request: web.Request) -> web.Response:
+        """Serve a v2 API call after any concurrency limit."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if token not in self._tokens:
+                return web.json_response({"code": "010104", "desc": "Token invalid"})
+            payload = await request.json()
+            return web.json_response(self._dispatch(payload))
+        finally:
+            self.in_flight -= 1
+
+    def _dispatch(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Run an API method and return the response envelope."""
+        method = payload.get("method", "")
+        if method == "Home.getDeviceList":
+            devices = [d.as_api() for d in self.devices.values()]
+            return {"code": "000000", "data": {"devices": devices}}
+
+        device = self.devices.get(payload.get("targetDevice", ""))
+        if device is None or payload.get("token") != device.token:
+            return {"code": "000201", "desc": "Device not found"}
+        action = method.rpartition(".")[2]
+        if action == "getState":
+            return {"code": "000000", "data": device.get_state()}
+        if action == "setState":
+            self._set_state(device, payload.get("params", {}))
+            return {"code": "000000", "data": dict(device.state)}
+        return {"code": "000101", "desc": f"Unsupported method {method}"}
+
+    def _set_state(self, device: FakeDevice, params: dict[str, Any]) -> None:
+        """Apply a setState and schedule the device's report."""
+        state = params.get("state")
+        if isinstance(state, dict) and "alarm" in state:
+            device.state["state"] = "alert" if state["alarm"] else "normal"
+        elif state is not None:
+            device.state["state"] = state
+        asyncio.get_running_loop().call_later(
+            self.report_delay, self.publish_report, device, "StatusChange"
+        )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run a hub until interrupted."""
+    hub = FakeHub(
+        device_count=args.devices,
+        latency=args.latency,
+        max_concurrency=args.max_concurrency,
+    )
+    await hub.start(args.host, args.http_port, args.mqtt_port)
+    if args.rate:
+        hub.start_events(args.rate)
+    print(
+        f"Fake hub with {args.devices} devices: HTTP port {hub.http_port}, "
+        f"MQTT port {hub.broker.port}, net ID {NET_ID}, "
+        f"client ID {CLIENT_ID}, client secret {CLIENT_SECRET}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await hub.stop()
+
+
+def main() -> None:
+    """Parse arguments and serve."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=1080)
+    parser.add_argument("--mqtt-port", type=int, default=18080)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--rate", type=float, default=0.0, help="events per second")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,46 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
+from .api import SharedRuntime
 from .const import (
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
     CONF_HUB_IP,
     CONF_NET_ID,
+    DATA_RUNTIME,
     DEFAULT_HTTP_PORT,
     DEFAULT_MQTT_PORT,
     DOMAIN,
     PLATFORMS,
 )
-from .coordinator import YoLocalCoordinator, create_coordinator
+from .coordinator import (
+    YoLocalCoordinator,
+    async_remove_snapshot,
+    create_coordinator,
+)
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the YoLink Local services."""
+    await async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up YoLink Local from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    # All hubs share one HTTP pool and MQTT ingestion pipeline
+    if DATA_RUNTIME not in hass.data:
+        hass.data[DATA_RUNTIME] = SharedRuntime(hass.loop)
+    hass.data[DATA_RUNTIME].acquire(entry.entry_id)
 
     try:
         coordinator = await create_coordinator(
@@ -35,9 +56,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             net_id=entry.data[CONF_NET_ID],
             http_port=DEFAULT_HTTP_PORT,
             mqtt_port=DEFAULT_MQTT_PORT,
+            entry_id=entry.entry_id,
+            runtime=hass.data[DATA_RUNTIME],
         )
     except Exception:
         _LOGGER.exception("Failed to set up YoLink Local")
+        await _async_release_runtime(hass, entry.entry_id)
         return False
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -54,5 +78,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         coordinator: YoLocalCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        await _async_release_runtime(hass, entry.entry_id)
 
     return unload_ok
+
+
+async def _async_release_runtime(hass: HomeAssistant, entry_id: str) -> None:
+    """Release an entry's hold on the shared runtime, closing it if unused."""
+    runtime: SharedRuntime | None = hass.data.get(DATA_RUNTIME)
+    if runtime is not None and runtime.release(entry_id):
+        del hass.data[DATA_RUNTIME]
+        await runtime.close()
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    await async_remove_snapshot(hass, entry.entry_id)
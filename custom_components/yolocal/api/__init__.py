@@ -5,17 +5,33 @@ Local Hub. It has no Home Assistant dependencies.
 """
 
 from .auth import AuthenticationError, TokenManager
-from .client import ApiError, YoLinkClient, create_client
+from .client import ApiError, YoLinkClient, create_client, create_session
 from .device import Device
-from .mqtt import DeviceEvent, YoLinkMQTTClient
+from .metrics import Metrics
+from .mqtt import (
+    MQTT_TRANSPORT_ASYNCIO,
+    MQTT_TRANSPORT_THREAD,
+    DeviceEvent,
+    YoLinkMQTTClient,
+)
+from .runtime import SharedRuntime
+from .scheduler import Priority, RequestCancelled, RequestScheduler
 
 __all__ = [
+    "MQTT_TRANSPORT_ASYNCIO",
+    "MQTT_TRANSPORT_THREAD",
     "ApiError",
     "AuthenticationError",
     "Device",
     "DeviceEvent",
+    "Metrics",
+    "Priority",
+    "RequestCancelled",
+    "RequestScheduler",
+    "SharedRuntime",
     "TokenManager",
     "YoLinkClient",
     "YoLinkMQTTClient",
     "create_client",
+    "create_session",
 ]
@@ -2,20 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
 
 import aiohttp
 
+from . import codec
+from .metrics import Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
 
 class AuthenticationError(Exception):
     """Raised when authentication fails."""
 
 
 class TokenManager:
-    """Handles OAuth token acquisition and refresh."""
+    """Handles OAuth token acquisition and refresh.
+
+    Concurrent callers share a single in-flight refresh. Once ``start()`` is
+    called, a background task renews the token before it reaches the
+    request-path refresh window, so requests do not wait on auth. Expiry is
+    tracked on the monotonic clock so wall-clock jumps cannot affect it.
+    """
 
     # Refresh token 5 minutes before expiry
     REFRESH_BUFFER_SECONDS = 300
+    # Background renewal happens 10 minutes before expiry
+    BACKGROUND_REFRESH_SECONDS = 600
+    # Delay before retrying a failed background renewal
+    BACKGROUND_RETRY_SECONDS = 30
 
     def __init__(
         self,
@@ -24,6 +41,7 @@ class TokenManager:
         client_secret: str,
         session: aiohttp.ClientSession,
         port: int = 1080,
+        metrics: Metrics | None = None,
     ) -> None:
         """Initialize the token manager."""
         self._host = host
@@ -31,8 +49,12 @@ class TokenManager:
         self._client_id = client_id
         self._client_secret = client_secret
         self._session = session
+        self._metrics = metrics or Metrics()
         self._token: str | None = None
         self._expires_at: float = 0
+        self._renew_at: float = 0
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._background_task: asyncio.Task[None] | None = None
 
     @property
     def base_url(self) -> str:
@@ -47,16 +69,64 @@ class TokenManager:
     async def get_token(self) -> str:
         """Return a valid token, refreshing if needed."""
         if self._is_expired():
-            await self._refresh()
+            await self._refresh_shared()
         if self._token is None:
             raise AuthenticationError("No token available")
         return self._token
 
+    def invalidate(self) -> None:
+        """Discard the cached token so the next call fetches a fresh one."""
+        self._token = None
+        self._expires_at = 0
+        self._renew_at = 0
+
     def _is_expired(self) -> bool:
         """Check if the token is expired or about to expire."""
         if self._token is None:
             return True
-        return time.time() >= (self._expires_at - self.REFRESH_BUFFER_SECONDS)
+        return time.monotonic() >= (self._expires_at - self.REFRESH_BUFFER_SECONDS)
+
+    def start(self) -> None:
+        """Start renewing the token in the background ahead of expiry."""
+        if self._background_task is None:
+            self._background_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background renewal and any in-flight refresh."""
+        tasks = [t for t in (self._background_task, self._refresh_task) if t]
+        self._background_task = None
+        self._refresh_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _refresh_loop(self) -> None:
+        """Renew the token shortly before it would need an inline refresh."""
+        while True:
+            delay = self._renew_at - time.monotonic()
+            if self._token is not None and delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            try:
+                await self._refresh_shared()
+            except Exception as err:
+                _LOGGER.warning("Background token refresh failed: %s", err)
+                await asyncio.sleep(self.BACKGROUND_RETRY_SECONDS)
+
+    async def _refresh_shared(self) -> None:
+        """Refresh the token, sharing one request among concurrent callers."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        await asyncio.shield(self._refresh_task)
+
+    def _on_refresh_done(self, task: asyncio.Task[None]) -> None:
+        """Clear the in-flight refresh once it completes."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled():
+            # Mark the exception retrieved; awaiting callers re-raise it
+            task.exception()
 
     async def _refresh(self) -> None:
         """Obtain a new token from the hub."""
@@ -66,15 +136,23 @@ class TokenManager:
             "client_id": self._client_id,
             "client_secret": self._client_secret,
         }
-        async with self._session.post(url, data=data) as resp:
-            resp.raise_for_status()
-            result = await resp.json()
+        self._metrics.inc("token_refreshes")
+        with self._metrics.timer("token_refresh"):
+            async with self._session.post(url, data=data) as resp:
+                resp.raise_for_status()
+                result = codec.loads(await resp.read())
 
         if "access_token" not in result:
+            self._metrics.inc("token_refresh_errors")
             raise AuthenticationError(f"Auth failed: {result}")
 
         self._token = result["access_token"]
         # Token expires_in is in seconds
         expires_in = result.get("expires_in", 7200)
-        self._expires_at = time.time() + expires_in
+        now = time.monotonic()
+        self._expires_at = now + expires_in
+        # Short-lived tokens are renewed halfway through their lifetime
+        self._renew_at = now + max(
+            expires_in - self.BACKGROUND_REFRESH_SECONDS, expires_in / 2
+        )
 
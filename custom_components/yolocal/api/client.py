@@ -2,20 +2,63 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import aiohttp
 
+from . import codec
 from .auth import AuthenticationError, TokenManager
 from .device import Device
+from .metrics import Metrics
+from .scheduler import Priority, RequestScheduler
+
+
+# The embedded hub falls over under parallel load; keep requests to it few
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+# Slots kept free for interactive commands
+RESERVED_INTERACTIVE_REQUESTS = 1
+# Seconds an idle keep-alive connection to the hub is kept open
+KEEPALIVE_TIMEOUT = 60.0
+REQUEST_TIMEOUT = 30.0
 
 
 class ApiError(Exception):
     """Raised when an API call fails."""
 
 
+def create_session() -> aiohttp.ClientSession:
+    """Create a session with a keep-alive pool tuned for YoLink hubs.
+
+    The pool puts no limit on connections to a hub: each ``YoLinkClient``
+    limits its own requests, so one session can serve several hubs with
+    different limits. It keeps connections alive between bursts so
+    requests skip the TCP handshake, and caches name resolution for the
+    life of the session (hub addresses are normally IP literals, which need
+    none).
+    """
+    connector = aiohttp.TCPConnector(
+        limit=0,
+        limit_per_host=0,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=None,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+
 class YoLinkClient:
-    """HTTP client for YoLink Local Hub."""
+    """HTTP client for YoLink Local Hub.
+
+    At most ``max_concurrent_requests`` API calls are in flight to the hub
+    at once. Further calls are queued by priority: commands go first and
+    always have a slot reserved, then targeted state fetches, then
+    background sweeps. ``timeout`` bounds how long a call may wait in the
+    queue, and then how long the hub may take to answer it.
+    """
 
     def __init__(
         self,
@@ -23,12 +66,18 @@ class YoLinkClient:
         token_manager: TokenManager,
         session: aiohttp.ClientSession,
         port: int = 1080,
+        metrics: Metrics | None = None,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
     ) -> None:
         """Initialize the client."""
         self._host = host
         self._port = port
         self._token_manager = token_manager
         self._session = session
+        self._metrics = metrics or Metrics()
+        self._scheduler = RequestScheduler(
+            max_concurrent_requests, RESERVED_INTERACTIVE_REQUESTS, self._metrics
+        )
 
     @property
     def host(self) -> str:
@@ -40,31 +89,64 @@ class YoLinkClient:
         """Return the base URL for the hub."""
         return f"http://{self._host}:{self._port}"
 
-    async def get_devices(self) -> list[Device]:
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """Return the request scheduler."""
+        return self._scheduler
+
+    def cancel_background(self) -> int:
+        """Drop queued background requests; returns how many were dropped."""
+        return self._scheduler.cancel(Priority.BACKGROUND)
+
+    async def get_devices(
+        self, priority: Priority = Priority.TARGETED
+    ) -> list[Device]:
         """Fetch the list of devices from the hub."""
-        result = await self._request({"method": "Home.getDeviceList"})
+        result = await self._request({"method": "Home.getDeviceList"}, priority)
         return [Device.from_api(d) for d in result.get("devices", [])]
 
-    async def get_state(self, device: Device) -> dict[str, Any]:
+    async def get_state(
+        self,
+        device: Device,
+        priority: Priority = Priority.TARGETED,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
         """Get the current state of a device."""
-        return await self._request({
-            "method": f"{device.device_type}.getState",
-            "targetDevice": device.device_id,
-            "token": device.token,
-        })
+        return await self._request(
+            {
+                "method": f"{device.device_type}.getState",
+                "targetDevice": device.device_id,
+                "token": device.token,
+            },
+            priority,
+            timeout,
+        )
 
     async def set_state(
-        self, device: Device, params: dict[str, Any]
+        self,
+        device: Device,
+        params: dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: float | None = None,
     ) -> dict[str, Any]:
         """Set the state of a device."""
-        return await self._request({
-            "method": f"{device.device_type}.setState",
-            "targetDevice": device.device_id,
-            "token": device.token,
-            "params": params,
-        })
-
-    async def _request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return await self._request(
+            {
+                "method": f"{device.device_type}.setState",
+                "targetDevice": device.device_id,
+                "token": device.token,
+                "params": params,
+            },
+            priority,
+            timeout,
+        )
+
+    async def _request(
+        self,
+        payload: dict[str, Any],
+        priority: Priority = Priority.TARGETED,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
         """Make an authenticated API request."""
         token = await self._token_manager.get_token()
         url = f"{self.base_url}/open/yolink/v2/api"
@@ -73,11 +155,17 @@ class YoLinkClient:
             "Authorization": f"Bearer {token}",
         }
 
-        async with self._session.post(url, json=payload, headers=headers) as resp:
-            resp.raise_for_status()
-            result = await resp.json()
+        self._metrics.inc("http_requests")
+        async with self._scheduler.slot(priority, timeout):
+            with self._metrics.timer("http_request"):
+                async with asyncio.timeout(timeout), self._session.post(
+                    url, data=codec.dumps(payload), headers=headers
+                ) as resp:
+                    resp.raise_for_status()
+                    result = codec.loads(await resp.read())
 
         if result.get("code") != "000000":
+            self._metrics.inc("api_errors")
             raise ApiError(f"API error: {result}")
 
         return result.get("data", {})
@@ -88,21 +176,25 @@ async def create_client(
     client_id: str,
     client_secret: str,
     port: int = 1080,
+    session: aiohttp.ClientSession | None = None,
 ) -> tuple["YoLinkClient", TokenManager, aiohttp.ClientSession]:
     """Create an authenticated client.
 
-    Returns the client, token manager, and session. Caller is responsible
-    for closing the session when done.
+    Returns the client, token manager, and session. If no session is given,
+    a tuned one is created and the caller is responsible for closing it.
 
     Raises:
         AuthenticationError: If credentials are invalid.
     """
-    session = aiohttp.ClientSession()
+    owns_session = session is None
+    if session is None:
+        session = create_session()
     try:
         token_manager = TokenManager(host, client_id, client_secret, session, port)
         await token_manager.get_token()  # Validates credentials
         client = YoLinkClient(host, token_manager, session, port)
         return client, token_manager, session
     except Exception:
-        await session.close()
+        if owns_session:
+            await session.close()
         raise
@@ -0,0 +1,46 @@
+"""JSON encoding and decoding for the HTTP and MQTT paths.
+
+orjson is a requirement of the integration (Home Assistant ships it
+too); the standard-library fallback keeps the API package usable without
+it but is no faster than plain ``json``. Payloads are parsed straight from
+``bytes``/``memoryview`` without an intermediate ``str``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Raised for malformed input by either backend (orjson's error subclasses it)
+JSONDecodeError = ValueError
+
+JSONInput = bytes | bytearray | memoryview | str
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(data: JSONInput) -> Any:
+        """Decode JSON from bytes or text."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode an object as compact JSON bytes."""
+        return orjson.dumps(obj)
+
+else:
+    BACKEND = "json"
+
+    def loads(data: JSONInput) -> Any:
+        """Decode JSON from bytes or text."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode an object as compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
@@ -0,0 +1,64 @@
+"""Suppression of duplicate and out-of-order device reports."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+
+from .metrics import Metrics
+
+# Message IDs remembered per device
+DEFAULT_HISTORY = 8
+
+
+class ReportFilter:
+    """Drop reports already applied, or older than one already applied.
+
+    Each device keeps the hub timestamp of its newest report and a small
+    ring of recent message IDs, so memory stays constant per device. Reports
+    without a message ID or timestamp are always accepted. Any report
+    older than the newest applied is dropped, however old; a hub whose
+    clock was set back is handled by ``reset()`` when it reconnects.
+    """
+
+    def __init__(
+        self,
+        history: int = DEFAULT_HISTORY,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """Initialize the filter."""
+        self._history = history
+        self._metrics = metrics or Metrics()
+        self._newest: dict[str, int | float] = {}
+        self._recent: dict[str, deque[str]] = {}
+
+    def accept(
+        self, device_id: str, msgid: str | None, reported_at: int | float | None
+    ) -> bool:
+        """Return True if a report is new and should be applied."""
+        if msgid is not None:
+            recent = self._recent.get(device_id)
+            if recent is None:
+                recent = self._recent[device_id] = deque(maxlen=self._history)
+            elif msgid in recent:
+                self._metrics.inc("events_duplicate")
+                return False
+        if reported_at is not None:
+            newest = self._newest.get(device_id)
+            if newest is not None and reported_at < newest:
+                self._metrics.inc("events_out_of_order")
+                return False
+            self._newest[device_id] = reported_at
+        if msgid is not None:
+            recent.append(msgid)
+        return True
+
+    def reset(self, device_ids: Iterable[str]) -> None:
+        """Forget the newest timestamps of these devices."""
+        for device_id in device_ids:
+            self._newest.pop(device_id, None)
+
+    def forget(self, device_id: str) -> None:
+        """Drop the history of a device."""
+        self._newest.pop(device_id, None)
+        self._recent.pop(device_id, None)
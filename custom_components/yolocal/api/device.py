@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import sys
 from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Device:
-    """Represents a YoLink device."""
+    """Represents a YoLink device.
+
+    IDs and type names are interned, so every reference to a device across
+    the caches shares one string object.
+    """
 
     device_id: str
     name: str
@@ -19,9 +24,17 @@ class Device:
     def from_api(cls, data: dict[str, Any]) -> Device:
         """Create a Device from API response data."""
         return cls(
-            device_id=data["deviceId"],
+            device_id=sys.intern(data["deviceId"]),
             name=data["name"],
             token=data["token"],
-            device_type=data["type"],
+            device_type=sys.intern(data["type"]),
         )
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device in the API response format."""
+        return {
+            "deviceId": self.device_id,
+            "name": self.name,
+            "token": self.token,
+            "type": self.device_type,
+        }
@@ -0,0 +1,161 @@
+"""Batched hand-off of MQTT events to the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import dataclasses
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .dedup import ReportFilter
+from .metrics import Metrics
+from .state import FULL_STATE_METHODS, merge_state, normalize_state
+
+if TYPE_CHECKING:
+    from .mqtt import DeviceEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10000
+
+BatchCallback = Callable[[list["DeviceEvent"]], None]
+
+
+class EventQueue:
+    """Bounded queue between the MQTT network loop and the event loop.
+
+    Events may be put from any thread. The event loop is woken once per
+    batch rather than once per message; it drains everything queued and
+    coalesces the events of each device into one, so every device is
+    delivered at most once per batch. Duplicate and out-of-order reports
+    are dropped by ``report_filter`` before coalescing, so they can neither
+    trigger an update nor fold an old value over a newer one.
+
+    With a ``window`` of 0 a batch is whatever arrived before the next loop
+    iteration; a positive window holds the batch open for that many seconds
+    to coalesce bursts further. When the queue is full, the oldest events
+    are dropped.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        deliver: BatchCallback,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        window: float = 0.0,
+        metrics: Metrics | None = None,
+        report_filter: ReportFilter | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self._loop = loop
+        self._deliver = deliver
+        self._maxsize = maxsize
+        self._window = window
+        self._queue: deque[DeviceEvent] = deque(maxlen=maxsize)
+        self._scheduled = False
+        self._scheduled_at = 0.0
+        self._metrics = metrics or Metrics()
+        self._filter = report_filter or ReportFilter(metrics=self._metrics)
+        self._received = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._rejected = 0
+        self._batches = 0
+        self._max_depth = 0
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return queue counters."""
+        return {
+            "depth": len(self._queue),
+            "max_depth": self._max_depth,
+            "received": self._received,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "rejected": self._rejected,
+            "batches": self._batches,
+            "coalesce_ratio": (
+                self._received / self._delivered if self._delivered else 1.0
+            ),
+        }
+
+    def put(self, event: DeviceEvent) -> None:
+        """Queue an event. Safe to call from any thread."""
+        self._received += 1
+        if len(self._queue) >= self._maxsize:
+            self._dropped += 1
+        self._queue.append(event)
+        if not self._scheduled:
+            self._scheduled = True
+            self._scheduled_at = time.perf_counter()
+            if self._window > 0:
+                self._call_on_loop(self._loop.call_later, self._window, self._drain)
+            else:
+                self._call_on_loop(self._drain)
+
+    def _call_on_loop(self, func: Callable[..., Any], *args: Any) -> None:
+        """Schedule a call on the event loop from whichever thread we are on."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._loop.call_soon(func, *args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _drain(self) -> None:
+        """Deliver everything queued as one coalesced batch."""
+        # Clear the flag first so events put during the drain get a new wakeup
+        self._scheduled = False
+        self._metrics.observe("queue_wait", time.perf_counter() - self._scheduled_at)
+        queue = self._queue
+        self._max_depth = max(self._max_depth, len(queue))
+        accept = self._filter.accept
+        pending: dict[str, DeviceEvent] = {}
+        while queue:
+            event = queue.popleft()
+            if not isinstance(event.data, dict):
+                # Skip just this report rather than failing the whole batch
+                self._rejected += 1
+                self._metrics.inc("events_malformed")
+                _LOGGER.warning(
+                    "Ignoring report from %s with malformed data: %r",
+                    event.device_id,
+                    event.data,
+                )
+                continue
+            if not accept(event.device_id, event.msgid, event.reported_at):
+                self._rejected += 1
+                continue
+            previous = pending.get(event.device_id)
+            pending[event.device_id] = (
+                event if previous is None else _coalesce(previous, event)
+            )
+        if not pending:
+            return
+
+        self._batches += 1
+        self._delivered += len(pending)
+        try:
+            self._deliver(list(pending.values()))
+        except Exception:
+            _LOGGER.exception("Error delivering event batch")
+
+
+def _coalesce(previous: DeviceEvent, event: DeviceEvent) -> DeviceEvent:
+    """Fold a later event for the same device into an earlier one."""
+    if event.event.rpartition(".")[2] in FULL_STATE_METHODS:
+        return event
+    # Normalized first so a nested sensor state cannot shadow newer fields
+    data, _ = merge_state(normalize_state(previous.data), event.event, event.data)
+    # A report folded into a full state is still a full state
+    name = (
+        previous.event
+        if previous.event.rpartition(".")[2] in FULL_STATE_METHODS
+        else event.event
+    )
+    return dataclasses.replace(event, event=name, data=data)
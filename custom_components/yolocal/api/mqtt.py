@@ -3,42 +3,79 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from collections.abc import Callable
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
 import paho.mqtt.client as mqtt
 
+from . import codec
+from .ingest import EventQueue
+from .metrics import Metrics
+
 _LOGGER = logging.getLogger(__name__)
 
+# Finds the event name in a raw payload without decoding the JSON
+_EVENT_RE = re.compile(rb'"event"\s*:\s*"([^"]*)"')
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceEvent:
-    """Represents an event received from a device."""
+    """Represents an event received from a device.
+
+    The full payload is only kept in ``raw`` while debug logging is on.
+    ``msgid`` and ``reported_at`` (hub time, epoch milliseconds) identify
+    the report for duplicate and out-of-order suppression.
+    """
 
     device_id: str
     event: str
     data: dict[str, Any]
-    raw: dict[str, Any]
+    raw: dict[str, Any] | None = None
+    msgid: str | None = None
+    reported_at: int | float | None = None
 
     @classmethod
     def from_payload(cls, payload: dict[str, Any]) -> DeviceEvent:
         """Create a DeviceEvent from MQTT payload."""
+        reported_at = payload.get("time")
         return cls(
-            device_id=payload.get("deviceId", ""),
-            event=payload.get("event", ""),
+            device_id=sys.intern(payload.get("deviceId", "")),
+            event=sys.intern(payload.get("event", "")),
             data=payload.get("data", {}),
-            raw=payload,
+            raw=payload if _LOGGER.isEnabledFor(logging.DEBUG) else None,
+            msgid=payload.get("msgid"),
+            reported_at=(
+                reported_at if isinstance(reported_at, int | float) else None
+            ),
         )
 
 
 EventCallback = Callable[[DeviceEvent], None]
+DisconnectCallback = Callable[[], None]
+
+MQTT_TRANSPORT_THREAD = "thread"
+MQTT_TRANSPORT_ASYNCIO = "asyncio"
+MQTT_TRANSPORTS = (MQTT_TRANSPORT_THREAD, MQTT_TRANSPORT_ASYNCIO)
 
 
 class YoLinkMQTTClient:
-    """MQTT client for receiving real-time device events."""
+    """MQTT client for receiving real-time device events.
+
+    Messages are handed to the event loop through an ``EventQueue``, which
+    batches them and coalesces reports per device. Pass a shared queue to
+    receive batches directly; otherwise a private queue feeds the callbacks
+    registered with ``subscribe()``.
+
+    With the ``thread`` transport, paho runs its network loop in a
+    background thread. With the ``asyncio`` transport, the paho socket is
+    driven from the event loop itself via ``add_reader``/``add_writer``, so
+    messages are handled without an extra thread or cross-thread wakeups.
+    """
 
     def __init__(
         self,
@@ -47,8 +84,19 @@ class YoLinkMQTTClient:
         client_id: str,
         access_token: str,
         port: int = 18080,
+        transport: str = MQTT_TRANSPORT_THREAD,
+        event_queue: EventQueue | None = None,
+        metrics: Metrics | None = None,
+        last_heard: dict[str, float] | None = None,
     ) -> None:
-        """Initialize the MQTT client."""
+        """Initialize the MQTT client.
+
+        If ``last_heard`` is given, it is updated with the monotonic time of
+        every message from an accepted device, including messages dropped
+        by the event filter, as a sign that the device is alive.
+        """
+        if transport not in MQTT_TRANSPORTS:
+            raise ValueError(f"Unknown MQTT transport: {transport}")
         self._host = host
         self._port = port
         self._net_id = net_id
@@ -56,45 +104,219 @@ class YoLinkMQTTClient:
         self._access_token = access_token
         self._client: mqtt.Client | None = None
         self._callbacks: list[EventCallback] = []
+        self._disconnect_callbacks: list[DisconnectCallback] = []
+        self._closing = False
         self._connected = asyncio.Event()
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._transport = transport
+        self._misc_task: asyncio.Task[None] | None = None
+        self._queue = event_queue
+        self._metrics = metrics or Metrics()
+        self._topic_prefix = f"ylsubnet/{net_id}/"
+        self._device_filter: frozenset[str] | None = None
+        self._ignored_events: frozenset[bytes] = frozenset()
+        self._last_heard = last_heard
+
+    @property
+    def transport(self) -> str:
+        """Return the network transport in use."""
+        return self._transport
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while connected to the broker."""
+        return self._connected.is_set()
 
     @property
     def topic(self) -> str:
         """Return the subscription topic."""
         return f"ylsubnet/{self._net_id}/+/report"
 
+    @property
+    def filtered_messages(self) -> int:
+        """Return the number of messages dropped by the pre-decode filters."""
+        return self._metrics.counters["mqtt_filtered"]
+
+    def set_device_filter(self, device_ids: Iterable[str] | None) -> None:
+        """Only process messages from these devices; ``None`` allows all.
+
+        The device ID is taken from the topic, so messages from other
+        devices are dropped before their payload is decoded.
+        """
+        self._device_filter = None if device_ids is None else frozenset(device_ids)
+
+    def set_event_filter(self, ignored_events: Iterable[str]) -> None:
+        """Drop messages for these event names (e.g. ``THSensor.Report``).
+
+        The event name is located in the raw payload bytes, so ignored
+        messages are dropped before their payload is decoded.
+        """
+        self._ignored_events = frozenset(event.encode() for event in ignored_events)
+
     def subscribe(self, callback: EventCallback) -> Callable[[], None]:
         """Subscribe to device events. Returns unsubscribe function."""
         self._callbacks.append(callback)
         return lambda: self._callbacks.remove(callback)
 
+    def add_disconnect_listener(
+        self, callback: DisconnectCallback
+    ) -> Callable[[], None]:
+        """Listen for unexpected connection loss. Returns unsubscribe function.
+
+        Callbacks run on the event loop. They are not called for
+        disconnects requested through ``disconnect()``.
+        """
+        self._disconnect_callbacks.append(callback)
+        return lambda: self._disconnect_callbacks.remove(callback)
+
     async def connect(self) -> None:
         """Connect to the MQTT broker."""
         self._loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = EventQueue(self._loop, self._dispatch, metrics=self._metrics)
+        self._closing = False
         self._client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
         self._client.username_pw_set(self._client_id, self._access_token)
         self._client.on_connect = self._on_connect
         self._client.on_disconnect = self._on_disconnect
         self._client.on_message = self._on_message
 
-        self._client.connect_async(self._host, self._port, keepalive=60)
-        self._client.loop_start()
+        if self._transport == MQTT_TRANSPORT_ASYNCIO:
+            self._client.on_socket_open = self._on_socket_open
+            self._client.on_socket_close = self._on_socket_close
+            self._client.on_socket_register_write = self._on_socket_register_write
+            self._client.on_socket_unregister_write = (
+                self._on_socket_unregister_write
+            )
+            # The TCP connect itself is blocking; everything after it runs
+            # on the event loop.
+            try:
+                await self._loop.run_in_executor(
+                    None, self._client.connect, self._host, self._port, 60
+                )
+            except OSError as err:
+                raise ConnectionError(
+                    f"Failed to connect to MQTT broker: {err}"
+                ) from err
+        else:
+            self._client.connect_async(self._host, self._port, keepalive=60)
+            self._client.loop_start()
 
         # Wait for connection with timeout
         try:
             await asyncio.wait_for(self._connected.wait(), timeout=10.0)
         except asyncio.TimeoutError:
+            # Stop paho from retrying in the background with these credentials
+            await self.disconnect()
             raise ConnectionError("Timed out connecting to MQTT broker")
 
     async def disconnect(self) -> None:
         """Disconnect from the MQTT broker."""
+        self._closing = True
         if self._client:
-            self._client.loop_stop()
-            self._client.disconnect()
+            if self._transport == MQTT_TRANSPORT_ASYNCIO:
+                self._client.disconnect()
+                # Flush the DISCONNECT packet; paho closes the socket after it
+                self._client.loop_write()
+                if self._misc_task:
+                    self._misc_task.cancel()
+                    self._misc_task = None
+            else:
+                self._client.loop_stop()
+                self._client.disconnect()
             self._client = None
         self._connected.clear()
 
+    def _run_on_loop(self, func: Callable[..., None], *args: Any) -> None:
+        """Run a function on the event loop, hopping threads only if needed."""
+        if self._loop is None:
+            func(*args)
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _dispatch(self, events: list[DeviceEvent]) -> None:
+        """Deliver a batch of events to the subscribed callbacks."""
+        for event in events:
+            for callback in self._callbacks:
+                try:
+                    callback(event)
+                except Exception:
+                    _LOGGER.exception("Error in event callback")
+
+    def _is_filtered(self, msg: mqtt.MQTTMessage) -> bool:
+        """Cheaply check whether a message should be dropped undecoded.
+
+        Messages from accepted devices are recorded in ``last_heard`` first.
+        """
+        device_filter = self._device_filter
+        last_heard = self._last_heard
+        if device_filter is not None or last_heard is not None:
+            topic = msg.topic
+            device_id = topic[len(self._topic_prefix) : topic.rfind("/")]
+            if device_filter is not None and device_id not in device_filter:
+                return True
+            if last_heard is not None:
+                last_heard[device_id] = time.monotonic()
+        if self._ignored_events:
+            match = _EVENT_RE.search(msg.payload)
+            if match and match.group(1) in self._ignored_events:
+                return True
+        return False
+
+    def _on_socket_open(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        """Start watching a newly opened socket (asyncio transport)."""
+        self._run_on_loop(self._async_on_socket_open, client, sock)
+
+    def _async_on_socket_open(self, client: mqtt.Client, sock: Any) -> None:
+        """Register the socket reader and start the housekeeping loop."""
+        assert self._loop is not None
+        self._loop.add_reader(sock, client.loop_read)
+        if self._misc_task is None or self._misc_task.done():
+            self._misc_task = self._loop.create_task(self._async_misc_loop(client))
+
+    def _on_socket_close(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        """Stop watching a socket that is about to close (asyncio transport)."""
+        # Capture the descriptor now; paho closes the socket right after this
+        self._run_on_loop(self._async_on_socket_close, sock.fileno())
+
+    def _async_on_socket_close(self, fileno: int) -> None:
+        """Unregister the socket reader and stop the housekeeping loop."""
+        assert self._loop is not None
+        self._loop.remove_reader(fileno)
+        if self._misc_task:
+            self._misc_task.cancel()
+            self._misc_task = None
+
+    def _on_socket_register_write(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        """Watch the socket for writability while paho has data queued."""
+        assert self._loop is not None
+        self._run_on_loop(self._loop.add_writer, sock, client.loop_write)
+
+    def _on_socket_unregister_write(
+        self, client: mqtt.Client, userdata: Any, sock: Any
+    ) -> None:
+        """Stop watching the socket for writability."""
+        assert self._loop is not None
+        self._run_on_loop(self._loop.remove_writer, sock.fileno())
+
+    async def _async_misc_loop(self, client: mqtt.Client) -> None:
+        """Drive paho's keepalive and retry handling from the event loop."""
+        while client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1)
+
     def _on_connect(
         self,
         client: mqtt.Client,
@@ -107,8 +329,7 @@ class YoLinkMQTTClient:
         if rc == 0 or str(rc) == "Success":
             _LOGGER.info("Connected to YoLink MQTT broker")
             client.subscribe(self.topic)
-            if self._loop:
-                self._loop.call_soon_threadsafe(self._connected.set)
+            self._run_on_loop(self._connected.set)
         else:
             _LOGGER.error("MQTT connection failed: %s", rc)
 
@@ -121,8 +342,23 @@ class YoLinkMQTTClient:
         properties: Any = None,
     ) -> None:
         """Handle disconnection."""
+        if self._closing:
+            _LOGGER.debug("Disconnected from MQTT broker: %s", rc)
+            self._run_on_loop(self._connected.clear)
+            return
         _LOGGER.warning("Disconnected from MQTT broker: %s", rc)
+        self._run_on_loop(self._async_on_connection_lost)
+
+    def _async_on_connection_lost(self) -> None:
+        """Notify listeners that the connection dropped unexpectedly."""
         self._connected.clear()
+        if self._closing:
+            return
+        for callback in list(self._disconnect_callbacks):
+            try:
+                callback()
+            except Exception:
+                _LOGGER.exception("Error in disconnect callback")
 
     def _on_message(
         self,
@@ -131,18 +367,24 @@ class YoLinkMQTTClient:
         msg: mqtt.MQTTMessage,
     ) -> None:
         """Handle incoming message."""
+        metrics = self._metrics
+        metrics.inc("mqtt_messages")
+        if self._is_filtered(msg):
+            metrics.inc("mqtt_filtered")
+            return
         try:
-            payload = json.loads(msg.payload.decode())
+            started = time.perf_counter()
+            payload = codec.loads(msg.payload)
+            metrics.observe("mqtt_decode", time.perf_counter() - started)
+            if isinstance(reported_at := payload.get("time"), int | float):
+                # Hub timestamp is epoch milliseconds; clocks may be skewed
+                lag = time.time() - reported_at / 1000
+                metrics.observe("event_lag", max(0.0, lag))
             event = DeviceEvent.from_payload(payload)
-            for callback in self._callbacks:
-                try:
-                    if self._loop:
-                        self._loop.call_soon_threadsafe(callback, event)
-                    else:
-                        callback(event)
-                except Exception:
-                    _LOGGER.exception("Error in event callback")
-        except json.JSONDecodeError:
+            if self._queue is not None:
+                self._queue.put(event)
+        except codec.JSONDecodeError:
+            metrics.inc("mqtt_decode_errors")
             _LOGGER.error("Failed to decode MQTT message: %s", msg.payload)
         except Exception:
             _LOGGER.exception("Error processing MQTT message")
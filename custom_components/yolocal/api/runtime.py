@@ -0,0 +1,150 @@
+"""Resources shared by every hub in one process."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .client import create_session
+from .dedup import ReportFilter
+from .ingest import DEFAULT_QUEUE_SIZE, BatchCallback, EventQueue
+from .metrics import Metrics
+from .mqtt import MQTT_TRANSPORT_ASYNCIO
+
+if TYPE_CHECKING:
+    from .mqtt import DeviceEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Hub:
+    """A hub registered with the runtime."""
+
+    owns: Callable[[str], bool]
+    deliver: BatchCallback
+    metrics: Metrics
+
+
+class SharedRuntime:
+    """One HTTP connection pool and MQTT ingestion pipeline for all hubs.
+
+    Each hub keeps its own MQTT connection, token, request scheduler and
+    concurrency limit, but their reports all go through one ``EventQueue``
+    and are routed back to the hub that owns the device. Hubs drive their
+    MQTT connections with ``mqtt_transport``, the event-loop transport by
+    default, so adding a hub adds no thread, session or event-loop wakeup
+    of its own. Counters of
+    the shared pipeline are kept in ``metrics``; ``as_dict()`` reports them
+    together with those of every hub.
+
+    Config entries ``acquire()`` the runtime before setting up their hub
+    and ``release()`` it when done, so it is only closed once no entry is
+    using it, including entries still waiting on their hub.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        coalesce_window: float = 0.0,
+        mqtt_transport: str = MQTT_TRANSPORT_ASYNCIO,
+    ) -> None:
+        """Initialize the runtime."""
+        self.mqtt_transport = mqtt_transport
+        self._session: aiohttp.ClientSession | None = None
+        self._hubs: dict[str, _Hub] = {}
+        self._users: set[str] = set()
+        self.metrics = Metrics()
+        self.report_filter = ReportFilter(metrics=self.metrics)
+        self.event_queue = EventQueue(
+            loop,
+            self._deliver,
+            maxsize=queue_size,
+            window=coalesce_window,
+            metrics=self.metrics,
+            report_filter=self.report_filter,
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session shared by all hubs."""
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+        return self._session
+
+    @property
+    def hubs(self) -> list[str]:
+        """Return the IDs of the registered hubs."""
+        return list(self._hubs)
+
+    def acquire(self, user: str) -> None:
+        """Keep the runtime open for ``user`` until it is released."""
+        self._users.add(user)
+
+    def release(self, user: str) -> bool:
+        """Release the runtime; returns True once nothing holds it."""
+        self._users.discard(user)
+        return not self._users
+
+    def add_hub(
+        self,
+        hub_id: str,
+        owns: Callable[[str], bool],
+        deliver: BatchCallback,
+        metrics: Metrics,
+    ) -> None:
+        """Route reports of the devices ``owns`` accepts to ``deliver``."""
+        self._hubs[hub_id] = _Hub(owns, deliver, metrics)
+
+    def remove_hub(self, hub_id: str) -> None:
+        """Stop routing reports to a hub."""
+        self._hubs.pop(hub_id, None)
+
+    async def close(self) -> None:
+        """Close the shared session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the shared pipeline's metrics and those of each hub."""
+        return {
+            "metrics": self.metrics.as_dict(),
+            "event_queue": self.event_queue.metrics,
+            "hubs": {
+                hub_id: hub.metrics.as_dict() for hub_id, hub in self._hubs.items()
+            },
+        }
+
+    def _deliver(self, events: list[DeviceEvent]) -> None:
+        """Split a batch by hub and hand each hub its events."""
+        hubs = self._hubs
+        if len(hubs) == 1:
+            # Nothing to route; the hub ignores devices it does not know
+            batches = {hub_id: events for hub_id in hubs}
+        else:
+            batches = self._route(events)
+        for hub_id, batch in batches.items():
+            try:
+                hubs[hub_id].deliver(batch)
+            except Exception:
+                _LOGGER.exception("Error delivering events to hub %s", hub_id)
+
+    def _route(self, events: list[DeviceEvent]) -> dict[str, list[DeviceEvent]]:
+        """Group events by the hub that owns their device."""
+        hubs = self._hubs
+        batches: dict[str, list[DeviceEvent]] = {}
+        for event in events:
+            for hub_id, hub in hubs.items():
+                if hub.owns(event.device_id):
+                    batches.setdefault(hub_id, []).append(event)
+                    break
+            else:
+                self.metrics.inc("events_unrouted")
+        return batches
@@ -0,0 +1,156 @@
+"""Priority scheduling of requests to the hub."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+import time
+
+from .metrics import Metrics
+
+
+class Priority(IntEnum):
+    """Request priority classes, most urgent first."""
+
+    # User-facing commands: locks, sirens, switches
+    INTERACTIVE = 0
+    # State fetches for specific devices that something is waiting on
+    TARGETED = 1
+    # Sweeps over the whole fleet
+    BACKGROUND = 2
+
+
+class RequestCancelled(Exception):
+    """Raised when a queued request is dropped before it was sent."""
+
+
+class RequestScheduler:
+    """Hand out request slots by priority.
+
+    Waiting requests are served most urgent first, then in arrival order.
+    ``reserved`` slots are kept for interactive requests only, so a command
+    never waits behind more than the interactive requests already in
+    flight, however many background requests are queued.
+
+    A request given a ``timeout`` fails with ``TimeoutError`` if it has not
+    been granted a slot in time.
+    """
+
+    def __init__(
+        self, slots: int, reserved: int = 1, metrics: Metrics | None = None
+    ) -> None:
+        """Initialize the scheduler."""
+        self._slots = max(1, slots)
+        self._reserved = max(0, min(reserved, self._slots - 1))
+        self._metrics = metrics or Metrics()
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of granted slots."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority, timeout: float | None = None
+    ) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the ``with`` block."""
+        await self._acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def cancel(self, priority: Priority = Priority.BACKGROUND) -> int:
+        """Drop queued requests of ``priority`` or less urgent.
+
+        Their callers get ``RequestCancelled``. Requests already in flight
+        are not affected. Returns the number of requests dropped.
+        """
+        dropped = 0
+        for waiter_priority, _, waiter in self._waiters:
+            if waiter_priority >= priority and not waiter.done():
+                waiter.set_exception(RequestCancelled("Request cancelled"))
+                dropped += 1
+        if dropped:
+            self._metrics.inc("requests_cancelled", dropped)
+            self._wake()
+        return dropped
+
+    def _limit(self, priority: int) -> int:
+        """Return how many slots requests of ``priority`` may use."""
+        if priority == Priority.INTERACTIVE:
+            return self._slots
+        return self._slots - self._reserved
+
+    async def _acquire(self, priority: Priority, timeout: float | None) -> None:
+        """Wait for a slot."""
+        queued = time.perf_counter()
+        self._prune()
+        # Only take a free slot if nobody as urgent is already waiting
+        if self._in_flight < self._limit(priority) and (
+            not self._waiters or self._waiters[0][0] > priority
+        ):
+            self._in_flight += 1
+        else:
+            loop = asyncio.get_running_loop()
+            waiter: asyncio.Future[None] = loop.create_future()
+            heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+            timer = (
+                loop.call_later(timeout, self._expire, waiter)
+                if timeout is not None
+                else None
+            )
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Granted just as we were cancelled: give the slot back
+                if waiter.done() and not waiter.cancelled() and not waiter.exception():
+                    self._release()
+                raise
+            finally:
+                if timer:
+                    timer.cancel()
+        self._metrics.observe(
+            f"queue_wait_{priority.name.lower()}", time.perf_counter() - queued
+        )
+
+    def _release(self) -> None:
+        """Return a slot and grant it to the next waiter."""
+        self._in_flight -= 1
+        self._wake()
+
+    def _expire(self, waiter: asyncio.Future[None]) -> None:
+        """Fail a waiter whose timeout passed before it got a slot."""
+        if not waiter.done():
+            self._metrics.inc("requests_expired")
+            waiter.set_exception(TimeoutError("Timed out waiting for a request slot"))
+            self._wake()
+
+    def _prune(self) -> None:
+        """Discard finished waiters from the head of the queue."""
+        waiters = self._waiters
+        while waiters and waiters[0][2].done():
+            heapq.heappop(waiters)
+
+    def _wake(self) -> None:
+        """Grant free slots to waiters in priority order."""
+        waiters = self._waiters
+        while True:
+            self._prune()
+            if not waiters or self._in_flight >= self._limit(waiters[0][0]):
+                return
+            _, _, waiter = heapq.heappop(waiters)
+            self._in_flight += 1
+            waiter.set_result(None)
@@ -0,0 +1,100 @@
+"""Detection of devices that have stopped reporting."""
+
+from __future__ import annotations
+
+import heapq
+
+
+class StalenessTracker:
+    """Track which devices have been silent for longer than expected.
+
+    ``last_heard`` maps device IDs to the monotonic time of their latest
+    message and is written by the caller, from any thread; recording a
+    message is a plain dict assignment. Deadlines are kept in a single heap
+    with one entry per device, and an entry is only re-examined when its
+    deadline comes due, so a check costs O(due devices), not O(devices).
+    """
+
+    def __init__(self, last_heard: dict[str, float]) -> None:
+        """Initialize the tracker."""
+        self._last_heard = last_heard
+        self._timeouts: dict[str, float] = {}
+        self._deadlines: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._stale: set[str] = set()
+
+    @property
+    def stale(self) -> frozenset[str]:
+        """Return the devices currently considered stale."""
+        return frozenset(self._stale)
+
+    def is_stale(self, device_id: str) -> bool:
+        """Return True if the device has missed its expected reports."""
+        return device_id in self._stale
+
+    def track(self, device_id: str, timeout: float, now: float) -> None:
+        """Expect a message from a device at least every ``timeout`` seconds.
+
+        A device never heard from is given one full timeout from ``now``.
+        """
+        self._timeouts[device_id] = timeout
+        self._stale.discard(device_id)
+        self._schedule(device_id, max(self._last_heard.get(device_id, now), now))
+
+    def untrack(self, device_id: str) -> None:
+        """Stop tracking a device."""
+        self._timeouts.pop(device_id, None)
+        self._deadlines.pop(device_id, None)
+        self._stale.discard(device_id)
+
+    def revive(self, device_id: str) -> bool:
+        """Clear a stale device just heard from; returns True if it was stale."""
+        if device_id not in self._stale or device_id not in self._last_heard:
+            return False
+        self._stale.discard(device_id)
+        self._schedule(device_id, self._last_heard[device_id])
+        return True
+
+    def check(
+        self, now: float, listening_since: float | None
+    ) -> tuple[list[str], list[str]]:
+        """Return the devices that went stale and those heard from again.
+
+        ``listening_since`` is when the message stream was last
+        (re)connected: nothing can have been heard before then, so no
+        device goes stale until a full timeout after it. Pass None while
+        disconnected to hold all devices in their current state.
+        """
+        expired: list[str] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, device_id = heapq.heappop(heap)
+            if self._deadlines.get(device_id) != deadline:
+                # Superseded or untracked
+                continue
+            del self._deadlines[device_id]
+            heard = max(
+                self._last_heard.get(device_id, 0.0),
+                listening_since if listening_since is not None else now,
+            )
+            if heard + self._timeouts[device_id] > now:
+                self._schedule(device_id, heard)
+            else:
+                self._stale.add(device_id)
+                expired.append(device_id)
+
+        revived = [
+            device_id
+            for device_id in self._stale
+            if self._last_heard.get(device_id, 0.0) + self._timeouts[device_id] > now
+        ]
+        for device_id in revived:
+            self._stale.discard(device_id)
+            self._schedule(device_id, self._last_heard[device_id])
+        return expired, revived
+
+    def _schedule(self, device_id: str, heard: float) -> None:
+        """Set a device's deadline to one timeout after it was last heard."""
+        deadline = heard + self._timeouts[device_id]
+        self._deadlines[device_id] = deadline
+        heapq.heappush(self._heap, (deadline, device_id))
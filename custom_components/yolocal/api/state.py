@@ -0,0 +1,79 @@
+"""Merging of device reports into cached device state."""
+
+from __future__ import annotations
+
+from itertools import chain
+import sys
+from typing import Any
+
+# Event methods whose data is a complete device state rather than a delta
+FULL_STATE_METHODS = frozenset({"getState"})
+
+# Hub metadata that no entity reads; not worth keeping per device
+DROPPED_FIELDS = frozenset({"deviceId", "loraInfo"})
+
+# Longer strings are free text rather than enum-like values worth sharing
+_INTERN_MAX_LENGTH = 16
+
+_MISSING = object()
+
+
+def normalize_state(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert a getState result or report into the cached state layout.
+
+    ``getState`` results for sensors nest readings in a ``state`` dict,
+    while MQTT reports (``Report``, ``Alert``, ``StatusChange``...) carry
+    the same fields flat. Cached states are always flat, with hub metadata
+    dropped and keys and short string values interned so thousands of
+    devices share them.
+
+    Raises:
+        TypeError: If ``data`` is not a dict.
+    """
+    if not isinstance(data, dict):
+        raise TypeError(f"Device state must be a dict, not {type(data).__name__}")
+    nested = data.get("state")
+    if isinstance(nested, dict):
+        items = chain(
+            ((key, value) for key, value in data.items() if key != "state"),
+            nested.items(),
+        )
+    else:
+        items = data.items()
+    intern = sys.intern
+    return {
+        intern(key): (
+            intern(value)
+            if type(value) is str and len(value) <= _INTERN_MAX_LENGTH
+            else value
+        )
+        for key, value in items
+        if key not in DROPPED_FIELDS
+    }
+
+
+def merge_state(
+    current: dict[str, Any], event: str, data: dict[str, Any]
+) -> tuple[dict[str, Any], frozenset[str]]:
+    """Merge event data into the cached state of a device.
+
+    ``data`` is normalized first; ``getState`` results replace the cached
+    state, anything else is merged into it so fields it omits are kept.
+
+    Returns the new state and the names of the fields that changed. The
+    cached dicts are never modified in place.
+    """
+    normalized = normalize_state(data)
+    if event.rpartition(".")[2] in FULL_STATE_METHODS or not current:
+        return normalized, _changed_fields(current, normalized, replace=True)
+    return {**current, **normalized}, _changed_fields(current, normalized)
+
+
+def _changed_fields(
+    old: dict[str, Any], new: dict[str, Any], replace: bool = False
+) -> frozenset[str]:
+    """Return the keys whose values differ between two dicts."""
+    changed = {key for key, value in new.items() if old.get(key, _MISSING) != value}
+    if replace:
+        changed.update(old.keys() - new.keys())
+    return frozenset(changed)
@@ -0,0 +1,100 @@
+"""Rate limiting of high-frequency device telemetry."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from numbers import Real
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class FieldThrottle:
+    """How often changes to one state field are worth publishing.
+
+    A change smaller than ``deadband`` is held back until the field has
+    gone ``max_silence`` seconds without being published (indefinitely if
+    None), and no change is published sooner than ``min_interval`` seconds
+    after the previous one.
+    """
+
+    deadband: float = 0.0
+    min_interval: float = 0.0
+    max_silence: float | None = None
+
+
+class ReportThrottle:
+    """Decide when a device's changed state should reach its listeners.
+
+    For each device with throttled fields, the values last published and
+    when are remembered; new values are compared against those, so a slow
+    drift is published once it adds up to the deadband. A change to any
+    field without a throttle is always published immediately.
+    """
+
+    def __init__(
+        self, fields_by_type: Mapping[str, Mapping[str, FieldThrottle]]
+    ) -> None:
+        """Initialize the throttle."""
+        self._fields_by_type = fields_by_type
+        self._published: dict[str, tuple[dict[str, Any], float]] = {}
+
+    def due(
+        self,
+        device_type: str,
+        device_id: str,
+        state: Mapping[str, Any],
+        changed: Iterable[str],
+        now: float,
+    ) -> float | None:
+        """Return when a state change should be published.
+
+        Returns a time at or before ``now`` to publish right away, a later
+        time to publish then, or None if the change is not worth publishing.
+        """
+        fields = self._fields_by_type.get(device_type)
+        published = self._published.get(device_id)
+        if not fields or published is None:
+            return now
+        values, published_at = published
+        due: float | None = None
+        for name in changed:
+            throttle = fields.get(name)
+            if throttle is None:
+                return now
+            if _exceeds(values.get(name), state.get(name), throttle.deadband):
+                candidate = published_at + throttle.min_interval
+            elif throttle.max_silence is not None:
+                candidate = published_at + throttle.max_silence
+            else:
+                continue
+            if due is None or candidate < due:
+                due = candidate
+        return due
+
+    def published(
+        self, device_type: str, device_id: str, state: Mapping[str, Any], now: float
+    ) -> None:
+        """Record the state a device's listeners have just been given."""
+        if fields := self._fields_by_type.get(device_type):
+            self._published[device_id] = (
+                {name: state.get(name) for name in fields},
+                now,
+            )
+
+    def forget(self, device_id: str) -> None:
+        """Drop what was published for a device."""
+        self._published.pop(device_id, None)
+
+
+def _exceeds(old: Any, new: Any, deadband: float) -> bool:
+    """Return True if a value moved by at least the deadband."""
+    if (
+        isinstance(old, Real)
+        and isinstance(new, Real)
+        and not isinstance(old, bool)
+        and not isinstance(new, bool)
+    ):
+        # Rounded so that e.g. 20.2 - 20.1 counts as a full 0.1 step
+        return round(abs(new - old), 9) >= deadband
+    return old != new
@@ -2,30 +2,22 @@
 
 from __future__ import annotations
 
-from homeassistant.components.binary_sensor import (
-    BinarySensorDeviceClass,
-    BinarySensorEntity,
-)
+from collections.abc import Iterable, Mapping
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import Device
+from .capabilities import YoLocalBinarySensorEntityDescription, iter_entity_descriptions
+from .const import DOMAIN, SIGNAL_NEW_DEVICES
 from .coordinator import YoLocalCoordinator
 from .entity import YoLocalEntity
 
 
-DEVICE_TYPE_TO_CLASS = {
-    "DoorSensor": BinarySensorDeviceClass.DOOR,
-    "LeakSensor": BinarySensorDeviceClass.MOISTURE,
-}
-
-DEVICE_TYPE_TO_ON_STATE = {
-    "DoorSensor": "open",
-    "LeakSensor": "alert",
-}
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -34,35 +26,29 @@ async def async_setup_entry(
     """Set up YoLink binary sensors from a config entry."""
     coordinator: YoLocalCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[BinarySensorEntity] = []
-    for device in coordinator.devices.values():
-        if device.device_type in DEVICE_TYPE_TO_CLASS:
-            entities.append(YoLocalBinarySensor(coordinator, device))
+    @callback
+    def async_add_devices(devices_by_type: Mapping[str, Iterable[Device]]) -> None:
+        async_add_entities(
+            YoLocalBinarySensor(coordinator, device, description)
+            for device, description in iter_entity_descriptions(
+                Platform.BINARY_SENSOR, devices_by_type
+            )
+        )
 
-    async_add_entities(entities)
+    async_add_devices(coordinator.devices_by_type)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices
+        )
+    )
 
 
 class YoLocalBinarySensor(YoLocalEntity, BinarySensorEntity):
-    """Binary sensor for YoLink door/leak sensors."""
+    """Binary sensor for YoLink door, leak and motion sensors."""
 
-    _attr_name = None  # Use device name
-
-    def __init__(self, coordinator: YoLocalCoordinator, device) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device)
-        self._attr_device_class = DEVICE_TYPE_TO_CLASS.get(device.device_type)
-        self._on_state = DEVICE_TYPE_TO_ON_STATE.get(device.device_type, "open")
+    entity_description: YoLocalBinarySensorEntityDescription
 
     @property
     def is_on(self) -> bool | None:
         """Return True if the sensor is triggered."""
-        state = self.device_state.get("state", {})
-        if isinstance(state, dict):
-            sensor_state = state.get("state")
-        else:
-            sensor_state = state
-
-        if sensor_state is None:
-            return None
-        return sensor_state == self._on_state
-
+        return self._value
@@ -0,0 +1,253 @@
+"""Entities provided for each YoLink device type.
+
+Supporting a new device type, or a new reading on an existing one, is a
+matter of adding entity descriptions to ``DEVICE_CAPABILITIES``. Each
+description carries a ``value_fn`` that pulls its value out of the flat
+cached device state.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.lock import LockEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.siren import SirenEntityDescription
+from homeassistant.components.switch import (
+    SwitchDeviceClass,
+    SwitchEntityDescription,
+)
+from homeassistant.const import PERCENTAGE, Platform, UnitOfTemperature
+from homeassistant.helpers.entity import EntityDescription
+
+from .api import Device
+from .api.throttle import FieldThrottle
+
+ValueFn = Callable[[dict[str, Any]], Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoLocalSensorEntityDescription(SensorEntityDescription):
+    """Describes a YoLink sensor.
+
+    A sensor with a ``throttle`` reads the state field named by its key,
+    and changes to that field are published at the rate it allows.
+    """
+
+    value_fn: ValueFn
+    throttle: FieldThrottle | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoLocalBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a YoLink binary sensor."""
+
+    value_fn: ValueFn
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoLocalLockEntityDescription(LockEntityDescription):
+    """Describes a YoLink lock."""
+
+    value_fn: ValueFn
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoLocalSwitchEntityDescription(SwitchEntityDescription):
+    """Describes a YoLink switch and the setState parameters it sends.
+
+    The parameters double as the optimistic state shown until the device
+    confirms the command.
+    """
+
+    value_fn: ValueFn
+    turn_on: dict[str, Any]
+    turn_off: dict[str, Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoLocalSirenEntityDescription(SirenEntityDescription):
+    """Describes a YoLink siren."""
+
+    value_fn: ValueFn
+
+
+def field_equals(name: str, on_value: str) -> ValueFn:
+    """Return an extractor for whether field ``name`` holds ``on_value``."""
+
+    def value_fn(state: dict[str, Any]) -> bool | None:
+        value = state.get(name)
+        return None if value is None else value == on_value
+
+    return value_fn
+
+
+def field(name: str) -> ValueFn:
+    """Return an extractor for a single state field."""
+
+    def value_fn(state: dict[str, Any]) -> Any:
+        return state.get(name)
+
+    return value_fn
+
+
+def battery_percent(state: dict[str, Any]) -> int | None:
+    """Convert YoLink's 0-4 battery level to a percentage."""
+    level = state.get("battery")
+    if level is None:
+        return None
+    return min(level * 25, 100)
+
+
+BATTERY = YoLocalSensorEntityDescription(
+    key="battery",
+    name="Battery",
+    device_class=SensorDeviceClass.BATTERY,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=PERCENTAGE,
+    value_fn=battery_percent,
+)
+TEMPERATURE = YoLocalSensorEntityDescription(
+    key="temperature",
+    name="Temperature",
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    value_fn=field("temperature"),
+    throttle=FieldThrottle(deadband=0.1, min_interval=60.0, max_silence=900.0),
+)
+HUMIDITY = YoLocalSensorEntityDescription(
+    key="humidity",
+    name="Humidity",
+    device_class=SensorDeviceClass.HUMIDITY,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=PERCENTAGE,
+    value_fn=field("humidity"),
+    throttle=FieldThrottle(deadband=1.0, min_interval=60.0, max_silence=900.0),
+)
+
+
+def _binary_sensor(
+    device_class: BinarySensorDeviceClass, on_state: str
+) -> YoLocalBinarySensorEntityDescription:
+    """Describe the primary binary sensor of a device."""
+    return YoLocalBinarySensorEntityDescription(
+        key="state",
+        name=None,  # Use device name
+        device_class=device_class,
+        value_fn=field_equals("state", on_state),
+    )
+
+
+def _relay(
+    field_name: str,
+    on_value: str,
+    off_value: str,
+    device_class: SwitchDeviceClass | None = None,
+) -> YoLocalSwitchEntityDescription:
+    """Describe a switch driven by setting one state field."""
+    return YoLocalSwitchEntityDescription(
+        key=field_name,
+        name=None,  # Use device name
+        device_class=device_class,
+        value_fn=field_equals(field_name, on_value),
+        turn_on={field_name: on_value},
+        turn_off={field_name: off_value},
+    )
+
+
+# Entities per device type and platform. A description named None is the
+# device's primary entity and keeps the bare device ID as its unique ID.
+DEVICE_CAPABILITIES: dict[str, dict[Platform, tuple[EntityDescription, ...]]] = {
+    "THSensor": {
+        Platform.SENSOR: (TEMPERATURE, HUMIDITY, BATTERY),
+    },
+    "DoorSensor": {
+        Platform.BINARY_SENSOR: (
+            _binary_sensor(BinarySensorDeviceClass.DOOR, "open"),
+        ),
+        Platform.SENSOR: (BATTERY,),
+    },
+    "LeakSensor": {
+        Platform.BINARY_SENSOR: (
+            _binary_sensor(BinarySensorDeviceClass.MOISTURE, "alert"),
+        ),
+        Platform.SENSOR: (BATTERY,),
+    },
+    "MotionSensor": {
+        Platform.BINARY_SENSOR: (
+            _binary_sensor(BinarySensorDeviceClass.MOTION, "alert"),
+        ),
+        Platform.SENSOR: (BATTERY,),
+    },
+    "Outlet": {
+        # YoLink uses "open" for on, "closed" for off (relay terminology)
+        Platform.SWITCH: (
+            _relay("state", "open", "closed", SwitchDeviceClass.OUTLET),
+        ),
+    },
+    "Dimmer": {
+        Platform.SWITCH: (
+            _relay("state", "open", "closed", SwitchDeviceClass.SWITCH),
+        ),
+    },
+    "WaterMeterController": {
+        Platform.SWITCH: (_relay("valve", "open", "close"),),
+        Platform.SENSOR: (BATTERY,),
+    },
+    "Lock": {
+        Platform.LOCK: (
+            YoLocalLockEntityDescription(
+                key="state",
+                name=None,  # Use device name
+                value_fn=field_equals("state", "locked"),
+            ),
+        ),
+    },
+    "Siren": {
+        Platform.SIREN: (
+            YoLocalSirenEntityDescription(
+                key="state",
+                name=None,  # Use device name
+                value_fn=field_equals("state", "alert"),
+            ),
+        ),
+    },
+}
+
+# The same registry keyed by platform first, for platform setup
+PLATFORM_CAPABILITIES: dict[Platform, dict[str, tuple[EntityDescription, ...]]] = {}
+for _type, _platforms in DEVICE_CAPABILITIES.items():
+    for _platform, _descriptions in _platforms.items():
+        PLATFORM_CAPABILITIES.setdefault(_platform, {})[_type] = _descriptions
+
+# Throttled state fields per device type, for the coordinator
+REPORT_THROTTLES: dict[str, dict[str, FieldThrottle]] = {}
+for _type, _platforms in DEVICE_CAPABILITIES.items():
+    for _descriptions in _platforms.values():
+        for _description in _descriptions:
+            if getattr(_description, "throttle", None) is not None:
+                REPORT_THROTTLES.setdefault(_type, {})[
+                    _description.key
+                ] = _description.throttle
+
+
+def iter_entity_descriptions(
+    platform: Platform, devices_by_type: Mapping[str, Iterable[Device]]
+) -> Iterator[tuple[Device, Any]]:
+    """Yield each device of a supported type with each of its descriptions."""
+    capabilities = PLATFORM_CAPABILITIES.get(platform, {})
+    for device_type, descriptions in capabilities.items():
+        for device in devices_by_type.get(device_type, ()):
+            for description in descriptions:
+                yield device, description
@@ -8,6 +8,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import AuthenticationError, create_client
 from .const import (
@@ -43,12 +44,13 @@ class YoLocalConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                client, _, session = await create_client(
+                # A one-off credential check can use the shared HA session
+                await create_client(
                     host=user_input[CONF_HUB_IP],
                     client_id=user_input[CONF_CLIENT_ID],
                     client_secret=user_input[CONF_CLIENT_SECRET],
+                    session=async_get_clientsession(self.hass),
                 )
-                await session.close()
             except AuthenticationError:
                 errors["base"] = "invalid_auth"
             except Exception:
@@ -1,5 +1,7 @@
 """Constants for the YoLink Local integration."""
 
+from datetime import timedelta
+
 DOMAIN = "yolocal"
 
 # Configuration keys
@@ -12,6 +14,94 @@ CONF_NET_ID = "net_id"
 DEFAULT_HTTP_PORT = 1080
 DEFAULT_MQTT_PORT = 18080
 
+# MQTT transport: "thread" (paho background loop) or "asyncio" (event loop).
+# Config entries use the shared runtime, whose hubs always use "asyncio"
+DEFAULT_MQTT_TRANSPORT = "thread"
+
+# MQTT ingestion: queued events, and seconds a batch is held open to coalesce
+DEFAULT_EVENT_QUEUE_SIZE = 10000
+DEFAULT_COALESCE_WINDOW = 0.0
+
+# MQTT reconnect backoff (seconds) and outage history length
+MQTT_RECONNECT_MIN_DELAY = 1.0
+MQTT_RECONNECT_MAX_DELAY = 300.0
+MQTT_OUTAGE_HISTORY = 20
+# Seconds after a reconnect before devices not heard from since the
+# disconnect are fetched
+MQTT_RESYNC_DELAY = 5.0
+
+# Event methods carrying settings or firmware details that no entity reads.
+# Reports of these methods are dropped by the MQTT client before decoding
+IGNORED_EVENT_METHODS = frozenset(
+    {
+        "getSchedules",
+        "setSchedules",
+        "getDelay",
+        "setDelay",
+        "setOpenRemind",
+        "setAlarm",
+        "getVersion",
+        "startUpgrade",
+    }
+)
+
+# Maximum concurrent HTTP requests to one hub
+DEFAULT_HUB_CONCURRENCY = 4
+
+# Seconds an optimistic command state waits for confirmation before rollback
+COMMAND_CONFIRM_TIMEOUT = 10.0
+
+# How often the hub's device list is checked for added/removed/renamed devices
+DEVICE_DISCOVERY_INTERVAL = timedelta(minutes=10)
+
+# Safety-net polling for missed MQTT reports. Each tick re-fetches the few
+# devices that have been silent longest relative to their type's interval
+RECONCILE_TICK = timedelta(seconds=30)
+RECONCILE_SLICE = 4
+RECONCILE_INTERVALS: dict[str, float] = {
+    "Lock": 900.0,
+    "Siren": 900.0,
+    "Outlet": 1800.0,
+    "DoorSensor": 1800.0,
+    "LeakSensor": 1800.0,
+    "THSensor": 7200.0,
+}
+RECONCILE_DEFAULT_INTERVAL = 3600.0
+# Interval multipliers while MQTT is down, and once it has been up a while
+RECONCILE_DISCONNECTED_FACTOR = 0.25
+RECONCILE_HEALTHY_FACTOR = 4.0
+RECONCILE_HEALTHY_AFTER = 3600.0
+
+# Expected heartbeat interval per device type (seconds). Devices report at
+# least this often even when nothing changes; one that misses
+# STALE_AFTER_MISSED_REPORTS in a row is shown as unavailable. Types listed
+# here report periodic telemetry, so an MQTT outage shorter than their
+# interval is not worth a resync
+DEVICE_HEARTBEAT_INTERVALS: dict[str, float] = {
+    "THSensor": 3600.0,
+}
+DEFAULT_HEARTBEAT_INTERVAL = 14400.0
+STALE_AFTER_MISSED_REPORTS = 2.5
+STALENESS_CHECK_INTERVAL = timedelta(seconds=60)
+
+# hass.data key of the runtime shared by all hubs
+DATA_RUNTIME = f"{DOMAIN}_runtime"
+
+# Dispatcher signal announcing new devices, formatted with the config entry ID
+SIGNAL_NEW_DEVICES = f"{DOMAIN}_new_devices_{{}}"
+
+# Initial state fetch
+DEFAULT_SETUP_CONCURRENCY = 8
+DEFAULT_STATE_TIMEOUT = 10.0
+
+# On-disk device/state snapshot used for warm startup
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 1
+# Seconds changes wait to be written. Telemetry changes the state all the
+# time, so writes are kept rare to spare SD cards; pending changes are
+# written at shutdown, as Home Assistant does for restored entity state
+SNAPSHOT_SAVE_DELAY = 900.0
+
 # API endpoints
 TOKEN_ENDPOINT = "/open/yolink/token"
 API_ENDPOINT = "/open/yolink/v2/api"
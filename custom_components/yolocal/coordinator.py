@@ -3,31 +3,139 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+import heapq
 import logging
+import random
+import time
 from typing import Any
 
 import aiohttp
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .api import (
     Device,
     DeviceEvent,
+    Metrics,
+    Priority,
+    RequestCancelled,
+    SharedRuntime,
     TokenManager,
     YoLinkClient,
     YoLinkMQTTClient,
+    create_session,
 )
 from .api.auth import AuthenticationError
+from .api.dedup import ReportFilter
+from .api.ingest import EventQueue
+from .api.staleness import StalenessTracker
+from .api.state import merge_state, normalize_state
+from .api.throttle import FieldThrottle, ReportThrottle
+from .capabilities import DEVICE_CAPABILITIES, REPORT_THROTTLES
+from .const import (
+    COMMAND_CONFIRM_TIMEOUT,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_EVENT_QUEUE_SIZE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HUB_CONCURRENCY,
+    DEFAULT_MQTT_TRANSPORT,
+    DEFAULT_SETUP_CONCURRENCY,
+    DEFAULT_STATE_TIMEOUT,
+    DEVICE_DISCOVERY_INTERVAL,
+    DEVICE_HEARTBEAT_INTERVALS,
+    DOMAIN,
+    IGNORED_EVENT_METHODS,
+    MQTT_OUTAGE_HISTORY,
+    MQTT_RECONNECT_MAX_DELAY,
+    MQTT_RECONNECT_MIN_DELAY,
+    MQTT_RESYNC_DELAY,
+    RECONCILE_DEFAULT_INTERVAL,
+    RECONCILE_DISCONNECTED_FACTOR,
+    RECONCILE_HEALTHY_AFTER,
+    RECONCILE_HEALTHY_FACTOR,
+    RECONCILE_INTERVALS,
+    RECONCILE_SLICE,
+    RECONCILE_TICK,
+    SIGNAL_NEW_DEVICES,
+    SNAPSHOT_SAVE_DELAY,
+    STALE_AFTER_MISSED_REPORTS,
+    STALENESS_CHECK_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Reports that never reach an entity, for the MQTT client's event filter
+_IGNORED_EVENTS = frozenset(
+    f"{device_type}.{method}"
+    for device_type in DEVICE_CAPABILITIES
+    for method in IGNORED_EVENT_METHODS
+)
+
+
+@dataclass
+class MqttOutage:
+    """A period during which the MQTT connection was down."""
+
+    started_at: float
+    duration: float
+    attempts: int
+
+
+@dataclass
+class DeviceListChanges:
+    """Devices added, removed or renamed on the hub since the last check."""
+
+    added: list[str]
+    removed: list[str]
+    renamed: list[str]
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.removed or self.renamed)
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one device's command in a bulk command."""
+
+    device_id: str
+    success: bool
+    duration: float
+    data: dict[str, Any] | None = None
+    error: str | None = None
+
+
+@dataclass
+class PendingCommand:
+    """Optimistic state awaiting confirmation by the device."""
+
+    values: dict[str, Any]
+    # Values the optimistic fields had before the command; _MISSING if unset
+    previous: dict[str, Any]
+    cancel_timeout: CALLBACK_TYPE
+
 
 class YoLocalCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
     """Coordinator for YoLink Local devices.
 
     Manages MQTT subscription for real-time updates and provides
-    device state to entities.
+    device state to entities. Events are dispatched only to the listeners
+    registered for the reporting device, so one report does not wake every
+    entity on the hub, and reported changes to throttled telemetry fields
+    are held back until they are large enough or have waited long enough.
     """
 
     def __init__(
@@ -38,8 +146,23 @@ class YoLocalCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
         session: aiohttp.ClientSession,
         net_id: str,
         mqtt_port: int = 18080,
+        setup_concurrency: int = DEFAULT_SETUP_CONCURRENCY,
+        state_timeout: float = DEFAULT_STATE_TIMEOUT,
+        mqtt_transport: str = DEFAULT_MQTT_TRANSPORT,
+        entry_id: str | None = None,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        event_queue_size: int = DEFAULT_EVENT_QUEUE_SIZE,
+        metrics: Metrics | None = None,
+        throttles: Mapping[str, Mapping[str, FieldThrottle]] = REPORT_THROTTLES,
+        runtime: SharedRuntime | None = None,
     ) -> None:
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        With a ``runtime``, reports are ingested through its shared event
+        queue and the session belongs to it; ``coalesce_window``,
+        ``event_queue_size`` and ``mqtt_transport`` are then the runtime's
+        to set.
+        """
         super().__init__(
             hass,
             _LOGGER,
@@ -50,39 +173,460 @@ class YoLocalCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
         self._session = session
         self._net_id = net_id
         self._mqtt_port = mqtt_port
+        self._setup_concurrency = max(1, setup_concurrency)
+        self._state_timeout = state_timeout
+        self._mqtt_transport = (
+            runtime.mqtt_transport if runtime is not None else mqtt_transport
+        )
         self._mqtt_client: YoLinkMQTTClient | None = None
+        self._metrics = metrics or Metrics()
+        self._runtime = runtime
+        # Key of this hub in the shared runtime
+        self._hub_id = entry_id or net_id
+        if runtime is not None:
+            self._report_filter = runtime.report_filter
+            self._event_queue = runtime.event_queue
+            runtime.add_hub(
+                self._hub_id, self._owns_device, self._on_device_events, self._metrics
+            )
+        else:
+            self._report_filter = ReportFilter(metrics=self._metrics)
+            self._event_queue = EventQueue(
+                hass.loop,
+                self._on_device_events,
+                maxsize=event_queue_size,
+                window=coalesce_window,
+                metrics=self._metrics,
+                report_filter=self._report_filter,
+            )
         self._devices: dict[str, Device] = {}
+        self._devices_by_type: dict[str, list[Device]] | None = None
         self._states: dict[str, dict[str, Any]] = {}
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._versions: dict[str, int] = {}
+        self._changed_fields: dict[str, frozenset[str]] = {}
+        self._last_event: dict[str, float] = {}
+        # Last report or successful fetch, and last reconcile attempt
+        self._last_seen: dict[str, float] = {}
+        self._last_polled: dict[str, float] = {}
+        self._mqtt_connected_at: float | None = None
+        self._poll_unsub: CALLBACK_TYPE | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+        # Any MQTT message, written from the MQTT thread
+        self._last_heard: dict[str, float] = {}
+        self._staleness = StalenessTracker(self._last_heard)
+        self._staleness_unsub: CALLBACK_TYPE | None = None
+        self._throttle = ReportThrottle(throttles)
+        # Deferred publishes of throttled changes: (due time, cancel)
+        self._publish_timers: dict[str, tuple[float, CALLBACK_TYPE]] = {}
+        self._event_counts: dict[str, int] = {}
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._resync_task: asyncio.Task[None] | None = None
+        self._mqtt_outages: deque[MqttOutage] = deque(maxlen=MQTT_OUTAGE_HISTORY)
+        self._shutting_down = False
+        self._store: Store[dict[str, Any]] | None = (
+            _snapshot_store(hass, entry_id) if entry_id else None
+        )
+        self._snapshot_pending = False
+        self._reconcile_task: asyncio.Task[None] | None = None
+        self._pending_commands: dict[str, PendingCommand] = {}
+        self._entry_id = entry_id
+        self._discovery_unsub: CALLBACK_TYPE | None = None
+        # Device list refreshes from the service and the timer run one at a time
+        self._refresh_lock = asyncio.Lock()
 
     @property
     def devices(self) -> dict[str, Device]:
         """Return the device registry."""
         return self._devices
 
+    @property
+    def devices_by_type(self) -> dict[str, list[Device]]:
+        """Return the devices indexed by type, built once per device list."""
+        if self._devices_by_type is None:
+            self._devices_by_type = group_by_type(self._devices.values())
+        return self._devices_by_type
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the hot-path counters and latency histograms."""
+        return self._metrics
+
+    @property
+    def event_queue_metrics(self) -> dict[str, Any]:
+        """Return MQTT ingestion queue counters."""
+        return self._event_queue.metrics
+
+    @property
+    def mqtt_outages(self) -> list[MqttOutage]:
+        """Return the most recent MQTT outages, oldest first."""
+        return list(self._mqtt_outages)
+
     async def _async_setup(self) -> None:
-        """Set up the coordinator: fetch devices and connect MQTT."""
+        """Set up the coordinator: fetch devices and connect MQTT.
+
+        If a snapshot from a previous run exists, devices and states are
+        restored from it and reconciled with the hub in the background, so
+        entities can be created without waiting on the hub. The periodic
+        timers only start once setup has succeeded.
+        """
+        if await self._async_load_snapshot():
+            self._async_track_staleness(self._devices.values())
+            self.data = self._states
+            self._reconcile_task = self.hass.async_create_background_task(
+                self._async_reconcile_snapshot(), "yolocal snapshot reconcile"
+            )
+            self._async_start_timers()
+            return
+
         devices = await self._client.get_devices()
         self._devices = {d.device_id: d for d in devices}
+        self._devices_by_type = None
+        self._async_track_staleness(devices)
 
-        for device in devices:
-            try:
-                state = await self._client.get_state(device)
-                self._states[device.device_id] = state
-            except Exception:
-                _LOGGER.warning("Failed to get initial state for %s", device.name)
-                self._states[device.device_id] = {}
+        await self._async_fetch_states(devices, Priority.BACKGROUND)
+        self.data = self._states
+        await self._connect_mqtt()
+        self._async_start_timers()
+
+    @callback
+    def _async_start_timers(self) -> None:
+        """Start device discovery, reconcile polling and staleness checks."""
+        self._discovery_unsub = async_track_time_interval(
+            self.hass,
+            self._async_discovery_tick,
+            DEVICE_DISCOVERY_INTERVAL,
+            name="yolocal device discovery",
+        )
+        self._poll_unsub = async_track_time_interval(
+            self.hass,
+            self._async_reconcile_tick,
+            RECONCILE_TICK,
+            name="yolocal reconcile",
+        )
+        self._staleness_unsub = async_track_time_interval(
+            self.hass,
+            self._async_check_staleness,
+            STALENESS_CHECK_INTERVAL,
+            name="yolocal staleness",
+        )
+
+    async def _async_load_snapshot(self) -> bool:
+        """Restore devices and states from the on-disk snapshot.
+
+        Returns False, leaving the caller to start cold, if there is no
+        usable snapshot.
+        """
+        if self._store is None:
+            return False
+        try:
+            snapshot = await self._store.async_load()
+        except Exception:
+            _LOGGER.warning("Failed to load device snapshot", exc_info=True)
+            return False
+        if not isinstance(snapshot, dict) or not snapshot.get("devices"):
+            return False
+
+        try:
+            devices = [Device.from_api(d) for d in snapshot["devices"]]
+            states = snapshot.get("states", {})
+            restored = {
+                d.device_id: normalize_state(states.get(d.device_id, {}))
+                for d in devices
+            }
+        except (AttributeError, KeyError, TypeError):
+            # Corrupt or from an incompatible version; start cold instead
+            _LOGGER.warning("Ignoring unreadable device snapshot", exc_info=True)
+            return False
+        self._devices = {d.device_id: d for d in devices}
+        self._devices_by_type = None
+        self._states = restored
+        _LOGGER.debug("Restored %d devices from snapshot", len(devices))
+        return True
 
+    async def _async_reconcile_snapshot(self) -> None:
+        """Bring snapshot-restored devices and states up to date with the hub."""
         await self._connect_mqtt()
+        added: list[str] = []
+        try:
+            changes = await self.async_refresh_devices(Priority.BACKGROUND)
+        except Exception:
+            _LOGGER.warning("Failed to fetch device list from hub", exc_info=True)
+        else:
+            added = changes.added
+        # Added devices were fetched with the device list
+        await self._async_fetch_states(
+            [d for d in self._devices.values() if d.device_id not in added],
+            Priority.BACKGROUND,
+        )
+
+    async def async_refresh_devices(
+        self, priority: Priority = Priority.TARGETED
+    ) -> DeviceListChanges:
+        """Bring the device list up to date with the hub.
+
+        Only the differences are acted on: new devices get their state
+        fetched and are announced to the platforms to create entities,
+        removed devices are dropped along with their entities, and renamed
+        devices are renamed in the device registry. Refreshes are serialized,
+        and new devices only join ``devices`` when they are announced, so no
+        device is announced twice.
+        """
+        async with self._refresh_lock:
+            return await self._async_refresh_devices(priority)
+
+    async def _async_refresh_devices(self, priority: Priority) -> DeviceListChanges:
+        """Diff the hub's device list against ours and apply the changes."""
+        live = {d.device_id: d for d in await self._client.get_devices(priority)}
+        known = self._devices
+        changes = DeviceListChanges(
+            added=[device_id for device_id in live if device_id not in known],
+            removed=[device_id for device_id in known if device_id not in live],
+            renamed=[
+                device_id
+                for device_id, device in live.items()
+                if device_id in known and known[device_id].name != device.name
+            ],
+        )
+        if not changes:
+            # Tokens may have been reissued even if nothing else changed
+            self._devices = live
+            self._devices_by_type = None
+            return changes
+
+        _LOGGER.info(
+            "Device list changed: %d added, %d removed, %d renamed",
+            len(changes.added),
+            len(changes.removed),
+            len(changes.renamed),
+        )
+        # Drop removed devices and pick up renames and new tokens now; added
+        # devices join when they are announced below
+        self._devices = {
+            device_id: device
+            for device_id, device in live.items()
+            if device_id in known
+        }
+        self._devices_by_type = None
+        for device_id in changes.removed:
+            self._async_forget_device(device_id)
+        self._async_update_device_registry(changes)
+        if changes.added:
+            added = [live[device_id] for device_id in changes.added]
+            await self._async_fetch_states(added, priority)
+            self._devices = live
+            self._devices_by_type = None
+            self._async_track_staleness(added)
+            if self._entry_id:
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_NEW_DEVICES.format(self._entry_id),
+                    group_by_type(added),
+                )
+        self._async_update_device_filter()
+        self._async_schedule_snapshot()
+        return changes
+
+    @callback
+    def _async_discovery_tick(self, _now: datetime) -> None:
+        """Check the hub for device list changes in the background."""
+        if self._reconcile_task and not self._reconcile_task.done():
+            return
+        self._reconcile_task = self.hass.async_create_background_task(
+            self._async_discover_devices(), "yolocal device discovery"
+        )
+
+    async def _async_discover_devices(self) -> None:
+        """Run a periodic device list check, logging rather than raising."""
+        try:
+            await self.async_refresh_devices(Priority.BACKGROUND)
+        except Exception as err:
+            _LOGGER.debug("Device discovery failed: %s", err)
+
+    @callback
+    def _async_forget_device(self, device_id: str) -> None:
+        """Drop everything cached for a device that left the hub."""
+        for cache in (
+            self._states,
+            self._versions,
+            self._changed_fields,
+            self._last_event,
+            self._last_seen,
+            self._last_polled,
+            self._event_counts,
+        ):
+            cache.pop(device_id, None)
+        if pending := self._pending_commands.pop(device_id, None):
+            pending.cancel_timeout()
+        if timer := self._publish_timers.pop(device_id, None):
+            timer[1]()
+        self._throttle.forget(device_id)
+        self._report_filter.forget(device_id)
+        self._staleness.untrack(device_id)
+        self._last_heard.pop(device_id, None)
+
+    @callback
+    def _async_update_device_registry(self, changes: DeviceListChanges) -> None:
+        """Remove and rename registry devices to match the hub.
+
+        Removing a device from the registry also removes its entities.
+        """
+        if not self._entry_id:
+            return
+        registry = dr.async_get(self.hass)
+        for device_id in (*changes.removed, *changes.renamed):
+            entry = registry.async_get_device(identifiers={(DOMAIN, device_id)})
+            if entry is None:
+                continue
+            if device_id in self._devices:
+                registry.async_update_device(
+                    entry.id, name=self._devices[device_id].name
+                )
+            else:
+                registry.async_update_device(
+                    entry.id, remove_config_entry_id=self._entry_id
+                )
+
+    @callback
+    def _async_schedule_snapshot(self) -> None:
+        """Schedule a batched snapshot write.
+
+        Writes happen at most once per ``SNAPSHOT_SAVE_DELAY``; changes made
+        while a write is pending are picked up by that write, and a pending
+        write is flushed at shutdown.
+        """
+        if self._store is None or self._snapshot_pending:
+            return
+        self._snapshot_pending = True
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        self._snapshot_pending = False
+        # The store serializes in the executor, so hand it copies
+        return {
+            "devices": [device.as_dict() for device in self._devices.values()],
+            "states": {
+                device_id: dict(state) for device_id, state in self._states.items()
+            },
+        }
+
+    async def _async_fetch_states(
+        self,
+        devices: list[Device],
+        priority: Priority = Priority.TARGETED,
+        log_summary: bool = True,
+    ) -> None:
+        """Fetch the state of many devices concurrently.
+
+        At most ``setup_concurrency`` requests are queued at once so the
+        hub is not flooded, and each device gets its own timeout, for its
+        wait in the request queue and again for the hub's answer, so a slow
+        or dead device cannot hold up the others. Requests are queued at
+        ``priority``, so a sweep never delays commands. A result is dropped
+        if the device's state changed while it was in flight, since the
+        report or command that changed it is newer than the result.
+        """
+        semaphore = asyncio.Semaphore(self._setup_concurrency)
+        started = time.monotonic()
+
+        async def fetch(device: Device) -> bool:
+            async with semaphore:
+                version = self.get_version(device.device_id)
+                try:
+                    state = await self._client.get_state(
+                        device, priority, self._state_timeout
+                    )
+                except TimeoutError:
+                    _LOGGER.warning("Timed out getting state for %s", device.name)
+                except RequestCancelled:
+                    _LOGGER.debug("State fetch for %s cancelled", device.name)
+                except Exception:
+                    _LOGGER.warning("Failed to get state for %s", device.name)
+                else:
+                    self._last_seen[device.device_id] = time.monotonic()
+                    if self.get_version(device.device_id) != version:
+                        self._metrics.inc("fetches_superseded")
+                        _LOGGER.debug(
+                            "Dropped state of %s older than its last update",
+                            device.name,
+                        )
+                    else:
+                        self._async_apply_state(
+                            device.device_id, f"{device.device_type}.getState", state
+                        )
+                    return True
+                finally:
+                    self._states.setdefault(device.device_id, {})
+            return False
+
+        results = await asyncio.gather(*(fetch(device) for device in devices))
+        _LOGGER.log(
+            logging.INFO if log_summary else logging.DEBUG,
+            "Fetched state for %d/%d devices in %.2fs (concurrency %d)",
+            sum(results),
+            len(devices),
+            time.monotonic() - started,
+            self._setup_concurrency,
+        )
+        self._async_schedule_snapshot()
 
     async def async_shutdown(self) -> None:
         """Shut down the coordinator."""
+        self._shutting_down = True
+        for task in (
+            self._reconnect_task,
+            self._resync_task,
+            self._reconcile_task,
+            self._poll_task,
+        ):
+            if task:
+                task.cancel()
+        self._reconnect_task = None
+        self._resync_task = None
+        self._reconcile_task = None
+        self._poll_task = None
+        for unsub in (self._discovery_unsub, self._poll_unsub, self._staleness_unsub):
+            if unsub:
+                unsub()
+        self._discovery_unsub = None
+        self._poll_unsub = None
+        self._staleness_unsub = None
+        self._client.cancel_background()
+        for pending in self._pending_commands.values():
+            pending.cancel_timeout()
+        self._pending_commands.clear()
+        for _due, cancel in self._publish_timers.values():
+            cancel()
+        self._publish_timers.clear()
+        await self._disconnect_mqtt()
+        if self._store is not None and self._snapshot_pending:
+            await self._store.async_save(self._snapshot_data())
+        await self._token_manager.stop()
+        if self._runtime is not None:
+            self._runtime.remove_hub(self._hub_id)
+        else:
+            await self._session.close()
+
+    async def _disconnect_mqtt(self) -> None:
+        """Tear down the current MQTT client, if any."""
         if self._mqtt_client:
-            await self._mqtt_client.disconnect()
-            self._mqtt_client = None
-        await self._session.close()
+            mqtt_client, self._mqtt_client = self._mqtt_client, None
+            await mqtt_client.disconnect()
 
     async def _connect_mqtt(self) -> None:
-        """Connect to MQTT broker."""
+        """Connect to MQTT broker, falling back to the reconnect loop."""
+        try:
+            await self._async_start_mqtt()
+            _LOGGER.info("Connected to YoLink MQTT broker")
+        except Exception:
+            _LOGGER.exception("Failed to connect to MQTT broker")
+            self._on_mqtt_disconnect()
+
+    async def _async_start_mqtt(self) -> None:
+        """Create an MQTT client with a current token and connect it."""
+        await self._disconnect_mqtt()
         token = await self._token_manager.get_token()
         host = self._client.host
 
@@ -92,38 +636,550 @@ class YoLocalCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
             client_id=self._token_manager.client_id,
             access_token=token,
             port=self._mqtt_port,
+            transport=self._mqtt_transport,
+            event_queue=self._event_queue,
+            metrics=self._metrics,
+            last_heard=self._last_heard,
         )
-        self._mqtt_client.subscribe(self._on_device_event)
-
-        try:
-            await self._mqtt_client.connect()
-            _LOGGER.info("Connected to YoLink MQTT broker")
-        except Exception:
-            _LOGGER.exception("Failed to connect to MQTT broker")
+        self._mqtt_client.set_device_filter(self._imported_device_ids())
+        self._mqtt_client.set_event_filter(_IGNORED_EVENTS)
+        self._mqtt_client.add_disconnect_listener(self._on_mqtt_disconnect)
+        await self._mqtt_client.connect()
+        self._mqtt_connected_at = time.monotonic()
 
     @callback
-    def _on_device_event(self, event: DeviceEvent) -> None:
-        """Handle a device event from MQTT."""
-        device_id = event.device_id
-        if device_id not in self._devices:
-            _LOGGER.debug("Ignoring event for unknown device: %s", device_id)
+    def _on_mqtt_disconnect(self) -> None:
+        """Start the reconnect loop after the MQTT connection drops."""
+        self._mqtt_connected_at = None
+        if self._shutting_down:
             return
+        if self._reconnect_task and not self._reconnect_task.done():
+            return
+        self._reconnect_task = self.hass.async_create_background_task(
+            self._async_reconnect_mqtt(), "yolocal MQTT reconnect"
+        )
+
+    async def _async_reconnect_mqtt(self) -> None:
+        """Reconnect to MQTT with jittered exponential backoff.
+
+        Every attempt uses a freshly issued token, since an expired token or
+        a hub restart is the usual reason the connection was lost.
+        """
+        lost_at = time.monotonic()
+        started_at = time.time()
+        await self._disconnect_mqtt()
+
+        delay = MQTT_RECONNECT_MIN_DELAY
+        attempts = 0
+        while True:
+            attempts += 1
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            self._token_manager.invalidate()
+            try:
+                await self._async_start_mqtt()
+            except Exception as err:
+                _LOGGER.debug("MQTT reconnect attempt %d failed: %s", attempts, err)
+                delay = min(delay * 2, MQTT_RECONNECT_MAX_DELAY)
+                continue
+            break
+
+        reconnected_at = time.monotonic()
+        # The hub may have restarted with its clock set back; recent message
+        # IDs are kept, so redelivered reports are still dropped
+        self._report_filter.reset(self._devices)
+        outage = MqttOutage(
+            started_at=started_at,
+            duration=reconnected_at - lost_at,
+            attempts=attempts,
+        )
+        self._mqtt_outages.append(outage)
+        _LOGGER.info(
+            "Reconnected to YoLink MQTT broker after %.1fs (%d attempts)",
+            outage.duration,
+            attempts,
+        )
+        # The resync replaces any sweep still queued from before the outage
+        if self._resync_task:
+            self._resync_task.cancel()
+        if dropped := self._client.cancel_background():
+            _LOGGER.debug("Dropped %d queued background requests", dropped)
+        self._resync_task = self.hass.async_create_background_task(
+            self._async_resync(lost_at, outage.duration), "yolocal MQTT resync"
+        )
+
+    async def _async_resync(self, lost_at: float, outage: float) -> None:
+        """Re-fetch devices that may have missed events while disconnected.
+
+        Only event-driven state can be wrong after an outage: devices with
+        periodic telemetry report again within their heartbeat interval, so
+        they are skipped unless the outage outlasted it. Devices heard from
+        since the connection dropped, including those that report within
+        ``MQTT_RESYNC_DELAY`` of it coming back, are already current, and
+        devices without entities have nothing to update. The rest are
+        fetched as background work, behind commands and targeted fetches.
+        """
+        await asyncio.sleep(MQTT_RESYNC_DELAY)
+        devices = [
+            device
+            for device_id, device in self._devices.items()
+            if device_id in self._device_listeners
+            and self._last_seen.get(device_id, 0.0) < lost_at
+            and outage >= DEVICE_HEARTBEAT_INTERVALS.get(device.device_type, 0.0)
+        ]
+        if devices:
+            await self._async_fetch_states(devices, Priority.BACKGROUND)
+
+    def _is_imported(self, device: Device) -> bool:
+        """Return True if a device has entities or anything listening to it."""
+        return (
+            device.device_type in DEVICE_CAPABILITIES
+            or device.device_id in self._device_listeners
+        )
+
+    def _imported_device_ids(self) -> list[str]:
+        """Return the devices whose MQTT reports are worth decoding."""
+        return [
+            device_id
+            for device_id, device in self._devices.items()
+            if self._is_imported(device)
+        ]
+
+    @callback
+    def _async_update_device_filter(self) -> None:
+        """Point the MQTT client's device allowlist at the imported devices."""
+        if self._mqtt_client:
+            self._mqtt_client.set_device_filter(self._imported_device_ids())
+
+    @callback
+    def _async_track_staleness(self, devices: Iterable[Device]) -> None:
+        """Start expecting regular reports from these devices.
+
+        Devices that are not imported are filtered out by the MQTT client,
+        so they are never heard from and not tracked.
+        """
+        now = time.monotonic()
+        for device in devices:
+            if not self._is_imported(device):
+                continue
+            interval = DEVICE_HEARTBEAT_INTERVALS.get(
+                device.device_type, DEFAULT_HEARTBEAT_INTERVAL
+            )
+            self._staleness.track(
+                device.device_id, interval * STALE_AFTER_MISSED_REPORTS, now
+            )
+
+    @callback
+    def _async_check_staleness(self, _now: datetime) -> None:
+        """Update availability of devices that went silent or came back."""
+        expired, revived = self._staleness.check(
+            time.monotonic(), self._mqtt_connected_at
+        )
+        for device_id in expired:
+            device = self._devices.get(device_id)
+            _LOGGER.info(
+                "%s has not reported for a while; marking it unavailable",
+                device.name if device else device_id,
+            )
+            self.async_update_device_listeners(device_id)
+        for device_id in revived:
+            self.async_update_device_listeners(device_id)
+
+    def is_stale(self, device_id: str) -> bool:
+        """Return True if a device has missed its expected reports."""
+        return self._staleness.is_stale(device_id)
+
+    @callback
+    def _async_reconcile_tick(self, _now: datetime) -> None:
+        """Re-fetch a slice of the devices that are overdue for a report.
+
+        A slice from the previous tick still waiting on the hub is stale by
+        now; it is cancelled and a fresh slice picked in its place.
+        """
+        if self._poll_task and not self._poll_task.done():
+            self._poll_task.cancel()
+            self._metrics.inc("reconcile_polls_replaced")
+        if devices := self._devices_due_for_reconcile():
+            self._poll_task = self.hass.async_create_background_task(
+                self._async_reconcile_poll(devices), "yolocal reconcile poll"
+            )
+
+    def _reconcile_factor(self) -> float:
+        """Return how much to stretch reconcile intervals given MQTT health."""
+        if self._mqtt_connected_at is None:
+            return RECONCILE_DISCONNECTED_FACTOR
+        if time.monotonic() - self._mqtt_connected_at >= RECONCILE_HEALTHY_AFTER:
+            return RECONCILE_HEALTHY_FACTOR
+        return 1.0
+
+    def _devices_due_for_reconcile(self) -> list[Device]:
+        """Return the most overdue devices, at most ``RECONCILE_SLICE``.
+
+        A device is due once it has been silent, and unpolled, for its
+        type's interval scaled by MQTT health. Only devices with entities
+        are considered.
+        """
+        now = time.monotonic()
+        factor = self._reconcile_factor()
+        overdue: list[tuple[float, Device]] = []
+        for device_id in self._device_listeners:
+            device = self._devices.get(device_id)
+            if device is None:
+                continue
+            interval = factor * RECONCILE_INTERVALS.get(
+                device.device_type, RECONCILE_DEFAULT_INTERVAL
+            )
+            silence = now - max(
+                self._last_seen.get(device_id, 0.0),
+                self._last_polled.get(device_id, 0.0),
+            )
+            if silence >= interval:
+                overdue.append((silence / interval, device))
+        return [
+            device
+            for _, device in heapq.nlargest(
+                RECONCILE_SLICE, overdue, key=lambda item: item[0]
+            )
+        ]
+
+    async def _async_reconcile_poll(self, devices: list[Device]) -> None:
+        """Fetch overdue devices and count the updates MQTT had missed.
+
+        Devices are only marked polled once the slice has finished, so a
+        slice cancelled in favour of a newer one leaves its devices due.
+        """
+        versions = {
+            device.device_id: self.get_version(device.device_id) for device in devices
+        }
+        await self._async_fetch_states(devices, Priority.BACKGROUND, False)
+        now = time.monotonic()
+        for device in devices:
+            self._last_polled[device.device_id] = now
+        corrected = [
+            device.name
+            for device in devices
+            if self.get_version(device.device_id) != versions[device.device_id]
+        ]
+        self._metrics.inc("reconcile_polls", len(devices))
+        if corrected:
+            self._metrics.inc("reconcile_corrections", len(corrected))
+            _LOGGER.debug("Reconcile found missed updates for %s", corrected)
+
+    @callback
+    def _on_device_events(self, events: list[DeviceEvent]) -> None:
+        """Handle a coalesced batch of device events from MQTT.
+
+        All states are applied first, then the listeners of each changed or
+        no longer stale device are notified once. Changes to throttled
+        fields alone may instead be published later, or not at all.
+        """
+        started = time.perf_counter()
+        now = time.monotonic()
+        updated: list[str] = []
+        changed_any = False
+        for event in events:
+            device_id = event.device_id
+            device = self._devices.get(device_id)
+            if device is None:
+                _LOGGER.debug("Ignoring event for unknown device: %s", device_id)
+                continue
+            self._last_event[device_id] = now
+            self._last_seen[device_id] = now
+            self._event_counts[device_id] = self._event_counts.get(device_id, 0) + 1
+            if device_id in self._pending_commands:
+                self._async_confirm_command(device_id, event.data)
+            changed = self._async_apply_state(
+                device_id, event.event, event.data, False
+            )
+            if self._staleness.revive(device_id):
+                updated.append(device_id)
+            elif changed:
+                due = self._throttle.due(
+                    device.device_type, device_id, self._states[device_id], changed, now
+                )
+                if due is None:
+                    self._metrics.inc("updates_suppressed")
+                elif due <= now:
+                    updated.append(device_id)
+                else:
+                    self._async_defer_update(device_id, due, now)
+            if changed:
+                changed_any = True
+
+        for device_id in updated:
+            self.async_update_device_listeners(device_id)
+        if changed_any or updated:
+            self._async_schedule_snapshot()
+        self._metrics.observe("dispatch", time.perf_counter() - started)
+
+    @callback
+    def _async_apply_state(
+        self, device_id: str, event: str, data: dict[str, Any], notify: bool = True
+    ) -> frozenset[str]:
+        """Merge new data into a device's cached state.
+
+        Listeners are only notified, and the version only bumped, when a
+        field actually changed. Returns the names of the changed fields.
+        """
+        state, changed = merge_state(self._states.get(device_id, {}), event, data)
+        if not changed:
+            return changed
+        self._states[device_id] = state
+        self._versions[device_id] = self._versions.get(device_id, 0) + 1
+        self._changed_fields[device_id] = changed
+        if notify:
+            self.async_update_device_listeners(device_id)
+            self._async_schedule_snapshot()
+        return changed
+
+    @callback
+    def async_add_device_listener(
+        self, device_id: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for state updates of a single device.
+
+        A device of a type without entities has its reports let through the
+        MQTT device filter while it has listeners.
+        """
+        listeners = self._device_listeners.setdefault(device_id, [])
+        listeners.append(update_callback)
+        if len(listeners) == 1 and self._is_listener_only(device_id):
+            self._async_update_device_filter()
 
-        self._states[device_id] = event.data
-        self.async_set_updated_data(self._states.copy())
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners and self._device_listeners.get(device_id) is listeners:
+                del self._device_listeners[device_id]
+                if self._is_listener_only(device_id):
+                    self._async_update_device_filter()
+
+        return remove_listener
+
+    @callback
+    def _async_defer_update(self, device_id: str, due: float, now: float) -> None:
+        """Notify a device's listeners at ``due`` unless notified before."""
+        if (timer := self._publish_timers.get(device_id)) is not None:
+            if timer[0] <= due:
+                return
+            timer[1]()
+        self._metrics.inc("updates_deferred")
+
+        @callback
+        def publish(_now: datetime) -> None:
+            del self._publish_timers[device_id]
+            self.async_update_device_listeners(device_id)
+
+        self._publish_timers[device_id] = (
+            due,
+            async_call_later(self.hass, due - now, publish),
+        )
+
+    @callback
+    def async_update_device_listeners(self, device_id: str) -> None:
+        """Notify the listeners of a single device."""
+        if timer := self._publish_timers.pop(device_id, None):
+            timer[1]()
+        if device := self._devices.get(device_id):
+            self._throttle.published(
+                device.device_type,
+                device_id,
+                self._states.get(device_id, {}),
+                time.monotonic(),
+            )
+        for update_callback in list(self._device_listeners.get(device_id, ())):
+            update_callback()
+
+    @callback
+    def async_get_diagnostics(self) -> dict[str, Any]:
+        """Return metrics and per-device event statistics."""
+        now = time.monotonic()
+        hours = max((now - self._metrics.started) / 3600, 1 / 3600)
+        return {
+            "metrics": self._metrics.as_dict(),
+            "event_queue": self.event_queue_metrics,
+            "mqtt_connected": self._mqtt_client is not None
+            and self._mqtt_client.is_connected,
+            "mqtt_transport": self._mqtt_transport,
+            "mqtt_outages": [vars(outage) for outage in self._mqtt_outages],
+            "shared_runtime": (
+                self._runtime.as_dict() if self._runtime is not None else None
+            ),
+            "devices": {
+                device_id: {
+                    "type": device.device_type,
+                    "events": self._event_counts.get(device_id, 0),
+                    "events_per_hour": round(
+                        self._event_counts.get(device_id, 0) / hours, 2
+                    ),
+                    "last_event_age_s": (
+                        round(now - self._last_event[device_id], 1)
+                        if device_id in self._last_event
+                        else None
+                    ),
+                    "version": self._versions.get(device_id, 0),
+                    "stale": self._staleness.is_stale(device_id),
+                }
+                for device_id, device in self._devices.items()
+            },
+        }
+
+    def _is_listener_only(self, device_id: str) -> bool:
+        """Return True if a device is only imported while it has listeners."""
+        device = self._devices.get(device_id)
+        return device is not None and device.device_type not in DEVICE_CAPABILITIES
+
+    def _owns_device(self, device_id: str) -> bool:
+        """Return True if a device belongs to this hub."""
+        return device_id in self._devices
 
     def get_state(self, device_id: str) -> dict[str, Any]:
         """Get the current state for a device."""
         return self._states.get(device_id, {})
 
+    def get_version(self, device_id: str) -> int:
+        """Return a counter that increases whenever a device's state changes."""
+        return self._versions.get(device_id, 0)
+
+    def get_changed_fields(self, device_id: str) -> frozenset[str]:
+        """Return the fields that changed in a device's last state update."""
+        return self._changed_fields.get(device_id, frozenset())
+
     async def async_send_command(
-        self, device_id: str, params: dict[str, Any]
+        self,
+        device_id: str,
+        params: dict[str, Any],
+        optimistic: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        """Send a command to a device."""
+        """Send a command to a device.
+
+        ``optimistic`` fields are applied to the cached state before the
+        command is sent, and the command response is applied as soon as it
+        arrives, so entities update without waiting for the device's next
+        report. Optimistic fields not confirmed by the response or a report
+        within ``COMMAND_CONFIRM_TIMEOUT`` are rolled back, as they are
+        immediately if the command fails.
+        """
         device = self._devices.get(device_id)
         if not device:
             raise ValueError(f"Unknown device: {device_id}")
-        return await self._client.set_state(device, params)
+        event = f"{device.device_type}.setState"
+        if optimistic:
+            self._async_add_pending_command(device_id, optimistic)
+            self._async_apply_state(device_id, event, optimistic)
+        try:
+            result = await self._client.set_state(device, params)
+        except Exception:
+            self._async_rollback_command(device_id)
+            raise
+        if not isinstance(result, dict):
+            # Nothing to confirm or apply; a report may still confirm it
+            return result
+        if device_id in self._pending_commands:
+            self._async_confirm_command(device_id, result)
+        if result:
+            self._async_apply_state(device_id, event, result)
+        return result
+
+    async def async_send_commands(
+        self,
+        device_ids: Iterable[str],
+        params: dict[str, Any],
+        optimistic: dict[str, Any] | None = None,
+    ) -> list[CommandResult]:
+        """Send the same command to many devices concurrently.
+
+        The commands run in parallel as far as the client's request limit
+        allows. A failure on one device does not stop the others; every
+        device gets a result in the order given.
+        """
+
+        async def send(device_id: str) -> CommandResult:
+            started = time.perf_counter()
+            try:
+                data = await self.async_send_command(device_id, params, optimistic)
+            except Exception as err:
+                _LOGGER.debug("Bulk command failed for %s: %s", device_id, err)
+                return CommandResult(
+                    device_id,
+                    False,
+                    time.perf_counter() - started,
+                    error=str(err) or type(err).__name__,
+                )
+            return CommandResult(
+                device_id, True, time.perf_counter() - started, data=data
+            )
+
+        return await asyncio.gather(*(send(device_id) for device_id in device_ids))
+
+    @callback
+    def _async_add_pending_command(
+        self, device_id: str, values: dict[str, Any]
+    ) -> None:
+        """Remember optimistic values so they can be rolled back."""
+        state = self._states.get(device_id, {})
+        previous = {key: state.get(key, _MISSING) for key in values}
+
+        @callback
+        def timed_out(_now: datetime) -> None:
+            self._async_rollback_command(device_id)
+
+        if existing := self._pending_commands.pop(device_id, None):
+            # Roll back to the last confirmed values, not earlier guesses
+            existing.cancel_timeout()
+            previous.update(existing.previous)
+            values = {**existing.values, **values}
+        self._pending_commands[device_id] = PendingCommand(
+            values=values,
+            previous=previous,
+            cancel_timeout=async_call_later(
+                self.hass, COMMAND_CONFIRM_TIMEOUT, timed_out
+            ),
+        )
+
+    @callback
+    def _async_confirm_command(self, device_id: str, data: dict[str, Any]) -> None:
+        """Settle a pending command once the device reports on its fields."""
+        pending = self._pending_commands[device_id]
+        if not data or pending.values.keys().isdisjoint(data):
+            return
+        pending.cancel_timeout()
+        del self._pending_commands[device_id]
+        self._metrics.inc("commands_confirmed")
+
+    @callback
+    def _async_rollback_command(self, device_id: str) -> None:
+        """Restore fields still holding unconfirmed optimistic values."""
+        pending = self._pending_commands.pop(device_id, None)
+        if pending is None:
+            return
+        pending.cancel_timeout()
+        self._metrics.inc("commands_rolled_back")
+        state = dict(self._states.get(device_id, {}))
+        changed = set()
+        for key, value in pending.values.items():
+            if state.get(key, _MISSING) != value:
+                continue
+            previous = pending.previous.get(key, _MISSING)
+            if previous is _MISSING:
+                state.pop(key, None)
+            else:
+                state[key] = previous
+            changed.add(key)
+        if not changed:
+            return
+        _LOGGER.debug("Rolled back unconfirmed %s on %s", sorted(changed), device_id)
+        self._states[device_id] = state
+        self._versions[device_id] = self._versions.get(device_id, 0) + 1
+        self._changed_fields[device_id] = frozenset(changed)
+        self.async_update_device_listeners(device_id)
+
+
+def group_by_type(devices: Iterable[Device]) -> dict[str, list[Device]]:
+    """Index devices by type."""
+    index: dict[str, list[Device]] = {}
+    for device in devices:
+        index.setdefault(device.device_type, []).append(device)
+    return index
 
 
 async def create_coordinator(
@@ -134,29 +1190,78 @@ async def create_coordinator(
     net_id: str,
     http_port: int = 1080,
     mqtt_port: int = 18080,
+    setup_concurrency: int = DEFAULT_SETUP_CONCURRENCY,
+    state_timeout: float = DEFAULT_STATE_TIMEOUT,
+    mqtt_transport: str = DEFAULT_MQTT_TRANSPORT,
+    entry_id: str | None = None,
+    coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+    hub_concurrency: int = DEFAULT_HUB_CONCURRENCY,
+    runtime: SharedRuntime | None = None,
 ) -> YoLocalCoordinator:
     """Create and initialize a coordinator.
 
-    Returns a fully-initialized, connected coordinator ready for use.
+    Returns a fully-initialized, connected coordinator ready for use. With
+    a ``runtime``, the hub shares its session, MQTT ingestion pipeline and
+    transport but keeps its own token and ``hub_concurrency`` limit.
 
     Raises:
         AuthenticationError: If credentials are invalid.
         Exception: If setup fails.
     """
-    session = aiohttp.ClientSession()
+    session = runtime.session if runtime else create_session()
+    metrics = Metrics()
+    token_manager = TokenManager(
+        host, client_id, client_secret, session, http_port, metrics=metrics
+    )
+    coordinator: YoLocalCoordinator | None = None
     try:
-        token_manager = TokenManager(host, client_id, client_secret, session, http_port)
         await token_manager.get_token()
+        token_manager.start()
 
-        client = YoLinkClient(host, token_manager, session, http_port)
+        client = YoLinkClient(
+            host,
+            token_manager,
+            session,
+            http_port,
+            metrics=metrics,
+            max_concurrent_requests=hub_concurrency,
+        )
 
         coordinator = YoLocalCoordinator(
-            hass, client, token_manager, session, net_id, mqtt_port
+            hass,
+            client,
+            token_manager,
+            session,
+            net_id,
+            mqtt_port,
+            setup_concurrency=setup_concurrency,
+            state_timeout=state_timeout,
+            mqtt_transport=mqtt_transport,
+            entry_id=entry_id,
+            coalesce_window=coalesce_window,
+            metrics=metrics,
+            runtime=runtime,
         )
         await coordinator._async_setup()
 
         return coordinator
     except Exception:
-        await session.close()
+        if coordinator is not None:
+            # Also stops any MQTT client or reconcile task setup started
+            await coordinator.async_shutdown()
+            raise
+        await token_manager.stop()
+        if runtime is None:
+            await session.close()
         raise
 
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the snapshot store for a config entry."""
+    # Device tokens are stored, so keep the file private
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry_id}", private=True)
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the snapshot of a removed config entry."""
+    await _snapshot_store(hass, entry_id).async_remove()
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import Device
@@ -13,19 +15,63 @@ from .coordinator import YoLocalCoordinator
 
 
 class YoLocalEntity(CoordinatorEntity[YoLocalCoordinator]):
-    """Base entity for YoLink Local devices."""
+    """Base entity for YoLink Local devices.
+
+    The value an entity exposes is extracted by its description's
+    ``value_fn`` once per device update and cached in ``_value``, and state
+    is only written when it or availability actually changed.
+    """
 
     _attr_has_entity_name = True
+    entity_description: Any
 
     def __init__(
         self,
         coordinator: YoLocalCoordinator,
         device: Device,
+        description: EntityDescription,
     ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
+        self.entity_description = description
         self._device = device
-        self._attr_unique_id = device.device_id
+        # A device's primary entity is keyed by the bare device ID
+        self._attr_unique_id = (
+            device.device_id
+            if description.name is None
+            else f"{device.device_id}_{description.key}"
+        )
+        self._value: Any = None
+        self._written: tuple[bool, Any] | None = None
+
+    def _extract_value(self, state: dict[str, Any]) -> Any:
+        """Return the value this entity exposes from the device state."""
+        return self.entity_description.value_fn(state)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates for this entity's device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self._device.device_id, self._handle_coordinator_update
+            )
+        )
+        # State is written right after this returns
+        self._value = self._extract_value(self.device_state)
+        self._written = (self.available, self._value)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the exposed value or availability changed."""
+        value = self._extract_value(self.device_state)
+        written = (self.available, value)
+        if written == self._written:
+            self.coordinator.metrics.inc("entity_writes_skipped")
+            return
+        self._value = value
+        self._written = written
+        self.coordinator.metrics.inc("entity_writes")
+        self.async_write_ha_state()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -45,6 +91,8 @@ class YoLocalEntity(CoordinatorEntity[YoLocalCoordinator]):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
+        if self.coordinator.is_stale(self._device.device_id):
+            return False
         state = self.device_state
         return state.get("online", True)
 
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from homeassistant.components.lock import LockEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import Device
+from .capabilities import YoLocalLockEntityDescription, iter_entity_descriptions
+from .const import DOMAIN, SIGNAL_NEW_DEVICES
 from .coordinator import YoLocalCoordinator
 from .entity import YoLocalEntity
 
@@ -22,32 +27,39 @@ async def async_setup_entry(
     """Set up YoLink locks from a config entry."""
     coordinator: YoLocalCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[LockEntity] = []
-    for device in coordinator.devices.values():
-        if device.device_type == "Lock":
-            entities.append(YoLocalLock(coordinator, device))
+    @callback
+    def async_add_devices(devices_by_type: Mapping[str, Iterable[Device]]) -> None:
+        async_add_entities(
+            YoLocalLock(coordinator, device, description)
+            for device, description in iter_entity_descriptions(
+                Platform.LOCK, devices_by_type
+            )
+        )
 
-    async_add_entities(entities)
+    async_add_devices(coordinator.devices_by_type)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices
+        )
+    )
 
 
 class YoLocalLock(YoLocalEntity, LockEntity):
     """Lock entity for YoLink smart lock."""
 
-    _attr_name = None  # Use device name
+    entity_description: YoLocalLockEntityDescription
 
     @property
     def is_locked(self) -> bool | None:
         """Return True if the lock is locked."""
-        state = self.device_state.get("state")
-        if state is None:
-            return None
-        return state == "locked"
+        return self._value
 
     async def async_lock(self, **kwargs: Any) -> None:
         """Lock the device."""
         await self.coordinator.async_send_command(
             self._device.device_id,
             {"state": "locked"},
+            optimistic={"state": "locked"},
         )
 
     async def async_unlock(self, **kwargs: Any) -> None:
@@ -55,5 +67,5 @@ class YoLocalLock(YoLocalEntity, LockEntity):
         await self.coordinator.async_send_command(
             self._device.device_id,
             {"state": "unlocked"},
+            optimistic={"state": "unlocked"},
         )
-
@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntity,
-    SensorStateClass,
-)
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
+import time
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import Device
+from .capabilities import YoLocalSensorEntityDescription, iter_entity_descriptions
+from .const import DOMAIN, SIGNAL_NEW_DEVICES
 from .coordinator import YoLocalCoordinator
 from .entity import YoLocalEntity
 
+# Only the hub diagnostic sensors poll; device sensors are pushed
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -25,84 +33,122 @@ async def async_setup_entry(
     """Set up YoLink sensors from a config entry."""
     coordinator: YoLocalCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[SensorEntity] = []
-    for device in coordinator.devices.values():
-        if device.device_type == "THSensor":
-            entities.append(YoLocalTemperatureSensor(coordinator, device))
-            entities.append(YoLocalHumiditySensor(coordinator, device))
-            entities.append(YoLocalBatterySensor(coordinator, device))
+    @callback
+    def async_add_devices(devices_by_type: Mapping[str, Iterable[Device]]) -> None:
+        async_add_entities(
+            YoLocalSensor(coordinator, device, description)
+            for device, description in iter_entity_descriptions(
+                Platform.SENSOR, devices_by_type
+            )
+        )
 
-    async_add_entities(entities)
+    async_add_devices(coordinator.devices_by_type)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices
+        )
+    )
 
+    async_add_entities([
+        YoLocalHubRoundTripSensor(coordinator, entry.entry_id),
+        YoLocalEventLagSensor(coordinator, entry.entry_id),
+        YoLocalEventRateSensor(coordinator, entry.entry_id),
+    ])
 
-class YoLocalTemperatureSensor(YoLocalEntity, SensorEntity):
-    """Temperature sensor for YoLink THSensor."""
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_name = "Temperature"
+class YoLocalSensor(YoLocalEntity, SensorEntity):
+    """Sensor for a YoLink device reading."""
 
-    def __init__(self, coordinator: YoLocalCoordinator, device) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device)
-        self._attr_unique_id = f"{device.device_id}_temperature"
+    entity_description: YoLocalSensorEntityDescription
 
     @property
-    def native_value(self) -> float | None:
-        """Return the temperature."""
-        state = self.device_state.get("state", {})
-        if isinstance(state, dict):
-            return state.get("temperature")
-        return self.device_state.get("temperature")
+    def native_value(self) -> Any:
+        """Return the sensor reading."""
+        return self._value
 
 
-class YoLocalHumiditySensor(YoLocalEntity, SensorEntity):
-    """Humidity sensor for YoLink THSensor."""
+class YoLocalHubDiagnosticSensor(SensorEntity):
+    """Base for hub performance sensors, disabled by default."""
 
-    _attr_device_class = SensorDeviceClass.HUMIDITY
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_name = "Humidity"
+    _attr_should_poll = True
+    _key: str
 
-    def __init__(self, coordinator: YoLocalCoordinator, device) -> None:
+    def __init__(self, coordinator: YoLocalCoordinator, entry_id: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, device)
-        self._attr_unique_id = f"{device.device_id}_humidity"
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{entry_id}_{self._key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name="YoLink Local Hub",
+            manufacturer="YoLink",
+            model="YS1606",
+        )
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the humidity."""
-        state = self.device_state.get("state", {})
-        if isinstance(state, dict):
-            return state.get("humidity")
-        return self.device_state.get("humidity")
 
+class YoLocalLatencySensor(YoLocalHubDiagnosticSensor):
+    """Mean of a latency histogram over the last polling interval."""
 
-class YoLocalBatterySensor(YoLocalEntity, SensorEntity):
-    """Battery sensor for YoLink devices."""
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 1
+    _histogram: str
 
-    _attr_device_class = SensorDeviceClass.BATTERY
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_name = "Battery"
-
-    def __init__(self, coordinator: YoLocalCoordinator, device) -> None:
+    def __init__(self, coordinator: YoLocalCoordinator, entry_id: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, device)
-        self._attr_unique_id = f"{device.device_id}_battery"
+        super().__init__(coordinator, entry_id)
+        self._last_count = 0
+        self._last_total = 0.0
+
+    async def async_update(self) -> None:
+        """Compute the mean of the samples recorded since the last update."""
+        histogram = self.coordinator.metrics.histograms.get(self._histogram)
+        if histogram is None:
+            return
+        count = histogram.count - self._last_count
+        total = histogram.total - self._last_total
+        self._last_count = histogram.count
+        self._last_total = histogram.total
+        self._attr_native_value = total / count * 1000 if count else None
 
-    @property
-    def native_value(self) -> int | None:
-        """Return the battery level as percentage."""
-        state = self.device_state.get("state", {})
-        if isinstance(state, dict):
-            level = state.get("battery")
-        else:
-            level = self.device_state.get("battery")
-
-        if level is None:
-            return None
-        # YoLink reports 0-4, convert to percentage
-        return min(level * 25, 100)
 
+class YoLocalHubRoundTripSensor(YoLocalLatencySensor):
+    """Average HTTP round-trip time to the hub."""
+
+    _attr_name = "Hub round-trip time"
+    _key = "hub_rtt"
+    _histogram = "http_request"
+
+
+class YoLocalEventLagSensor(YoLocalLatencySensor):
+    """Average delay between a hub report timestamp and its receipt."""
+
+    _attr_name = "Event lag"
+    _key = "event_lag"
+    _histogram = "event_lag"
+
+
+class YoLocalEventRateSensor(YoLocalHubDiagnosticSensor):
+    """MQTT messages received per minute."""
+
+    _attr_name = "Event rate"
+    _attr_native_unit_of_measurement = "events/min"
+    _key = "event_rate"
+
+    def __init__(self, coordinator: YoLocalCoordinator, entry_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry_id)
+        self._last_count: int | None = None
+        self._last_time = 0.0
+
+    async def async_update(self) -> None:
+        """Compute the message rate since the last update."""
+        now = time.monotonic()
+        count = self.coordinator.metrics.counters.get("mqtt_messages", 0)
+        if self._last_count is not None and now > self._last_time:
+            rate = (count - self._last_count) / (now - self._last_time) * 60
+            self._attr_native_value = round(rate, 1)
+        self._last_count = count
+        self._last_time = now
@@ -0,0 +1,116 @@
+"""Services for the YoLink Local integration."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_entity_ids
+
+from .const import DOMAIN
+from .coordinator import YoLocalCoordinator
+
+SERVICE_BULK_COMMAND = "bulk_command"
+SERVICE_REFRESH_DEVICES = "refresh_devices"
+
+ATTR_PARAMS = "params"
+ATTR_OPTIMISTIC = "optimistic"
+
+BULK_COMMAND_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_PARAMS): dict,
+        vol.Optional(ATTR_OPTIMISTIC): dict,
+    }
+)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def bulk_command(call: ServiceCall) -> ServiceResponse:
+        """Send one command to every targeted device at once.
+
+        Targets are resolved to hub devices (entities of the same device
+        share one command) and grouped by hub, and each hub runs its
+        commands concurrently.
+        """
+        started = time.perf_counter()
+        registry = er.async_get(hass)
+        coordinators: dict[str, YoLocalCoordinator] = hass.data.get(DOMAIN, {})
+        by_hub: dict[str, set[str]] = {}
+        for entity_id in await async_extract_entity_ids(hass, call):
+            entry = registry.async_get(entity_id)
+            if entry is None or entry.platform != DOMAIN:
+                continue
+            coordinator = coordinators.get(entry.config_entry_id)
+            # Only a device's primary entity is keyed by the hub device ID
+            if coordinator and entry.unique_id in coordinator.devices:
+                by_hub.setdefault(entry.config_entry_id, set()).add(entry.unique_id)
+        if not by_hub:
+            raise ServiceValidationError("No YoLink Local devices targeted")
+
+        batches = await asyncio.gather(
+            *(
+                coordinators[entry_id].async_send_commands(
+                    sorted(device_ids),
+                    call.data[ATTR_PARAMS],
+                    call.data.get(ATTR_OPTIMISTIC),
+                )
+                for entry_id, device_ids in by_hub.items()
+            )
+        )
+        results = [result for batch in batches for result in batch]
+        return {
+            "succeeded": sum(result.success for result in results),
+            "failed": sum(not result.success for result in results),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "results": {
+                result.device_id: {
+                    "success": result.success,
+                    "duration_ms": round(result.duration * 1000, 1),
+                    **(
+                        {"data": result.data}
+                        if result.success
+                        else {"error": result.error}
+                    ),
+                }
+                for result in results
+            },
+        }
+
+    async def refresh_devices(call: ServiceCall) -> ServiceResponse:
+        """Pick up devices added, removed or renamed on every hub."""
+        coordinators: dict[str, YoLocalCoordinator] = hass.data.get(DOMAIN, {})
+        entry_ids = list(coordinators)
+        changes = await asyncio.gather(
+            *(coordinators[entry_id].async_refresh_devices() for entry_id in entry_ids)
+        )
+        return {
+            entry_id: dataclasses.asdict(change)
+            for entry_id, change in zip(entry_ids, changes)
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_DEVICES,
+        refresh_devices,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        bulk_command,
+        schema=BULK_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
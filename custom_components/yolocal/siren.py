@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from homeassistant.components.siren import SirenEntity, SirenEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import Device
+from .capabilities import YoLocalSirenEntityDescription, iter_entity_descriptions
+from .const import DOMAIN, SIGNAL_NEW_DEVICES
 from .coordinator import YoLocalCoordinator
 from .entity import YoLocalEntity
 
@@ -22,33 +27,40 @@ async def async_setup_entry(
     """Set up YoLink sirens from a config entry."""
     coordinator: YoLocalCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[SirenEntity] = []
-    for device in coordinator.devices.values():
-        if device.device_type == "Siren":
-            entities.append(YoLocalSiren(coordinator, device))
+    @callback
+    def async_add_devices(devices_by_type: Mapping[str, Iterable[Device]]) -> None:
+        async_add_entities(
+            YoLocalSiren(coordinator, device, description)
+            for device, description in iter_entity_descriptions(
+                Platform.SIREN, devices_by_type
+            )
+        )
 
-    async_add_entities(entities)
+    async_add_devices(coordinator.devices_by_type)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices
+        )
+    )
 
 
 class YoLocalSiren(YoLocalEntity, SirenEntity):
     """Siren entity for YoLink siren."""
 
-    _attr_name = None  # Use device name
+    entity_description: YoLocalSirenEntityDescription
     _attr_supported_features = SirenEntityFeature.TURN_ON | SirenEntityFeature.TURN_OFF
 
     @property
     def is_on(self) -> bool | None:
         """Return True if the siren is sounding."""
-        state = self.device_state.get("state")
-        if state is None:
-            return None
-        return state == "alert"
+        return self._value
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the siren."""
         await self.coordinator.async_send_command(
             self._device.device_id,
             {"state": {"alarm": True}},
+            optimistic={"state": "alert"},
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
@@ -56,5 +68,6 @@ class YoLocalSiren(YoLocalEntity, SirenEntity):
         await self.coordinator.async_send_command(
             self._device.device_id,
             {"state": {"alarm": False}},
+            optimistic={"state": "normal"},
         )
 
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from typing import Any
 
-from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
+from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .api import Device
+from .capabilities import YoLocalSwitchEntityDescription, iter_entity_descriptions
+from .const import DOMAIN, SIGNAL_NEW_DEVICES
 from .coordinator import YoLocalCoordinator
 from .entity import YoLocalEntity
 
@@ -22,40 +27,47 @@ async def async_setup_entry(
     """Set up YoLink switches from a config entry."""
     coordinator: YoLocalCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[SwitchEntity] = []
-    for device in coordinator.devices.values():
-        if device.device_type == "Outlet":
-            entities.append(YoLocalSwitch(coordinator, device))
+    @callback
+    def async_add_devices(devices_by_type: Mapping[str, Iterable[Device]]) -> None:
+        async_add_entities(
+            YoLocalSwitch(coordinator, device, description)
+            for device, description in iter_entity_descriptions(
+                Platform.SWITCH, devices_by_type
+            )
+        )
 
-    async_add_entities(entities)
+    async_add_devices(coordinator.devices_by_type)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices
+        )
+    )
 
 
 class YoLocalSwitch(YoLocalEntity, SwitchEntity):
-    """Switch entity for YoLink outlet."""
+    """Switch entity for YoLink outlets, dimmers and valves."""
 
-    _attr_device_class = SwitchDeviceClass.OUTLET
-    _attr_name = None  # Use device name
+    entity_description: YoLocalSwitchEntityDescription
 
     @property
     def is_on(self) -> bool | None:
         """Return True if the switch is on."""
-        state = self.device_state.get("state")
-        if state is None:
-            return None
-        # YoLink uses "open" for on, "closed" for off (relay terminology)
-        return state == "open"
+        return self._value
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
+        params = self.entity_description.turn_on
         await self.coordinator.async_send_command(
             self._device.device_id,
-            {"state": "open"},
+            params,
+            optimistic=params,
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
+        params = self.entity_description.turn_off
         await self.coordinator.async_send_command(
             self._device.device_id,
-            {"state": "closed"},
+            params,
+            optimistic=params,
         )
-
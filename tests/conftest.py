@@ -0,0 +1,14 @@
+"""Shared test setup.
+
+The ``api`` package has no Home Assistant dependency, so it is imported
+directly, as the benchmarks do. Tests of the integration itself import it
+as ``custom_components.yolocal`` and are skipped without Home Assistant.
+"""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "custom_components" / "yolocal"))
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,158 @@
+"""Tests for token refresh sharing and background renewal."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import json
+from typing import Any
+
+import pytest
+
+from api.auth import AuthenticationError, TokenManager
+
+
+class _FakeSession:
+    """Answers token requests, optionally holding them until released."""
+
+    def __init__(self, expires_in: float = 7200, fail: bool = False) -> None:
+        """Initialize the session; numbered tokens last ``expires_in``."""
+        self.requests = 0
+        self.expires_in = expires_in
+        self.fail = fail
+        self.release = asyncio.Event()
+        self.release.set()
+
+    @asynccontextmanager
+    async def post(self, url: str, data: dict[str, Any]) -> AsyncIterator[Any]:
+        """Answer a token request once ``release`` is set."""
+        self.requests += 1
+        number = self.requests
+        await self.release.wait()
+        result = (
+            {"error": "invalid_client"}
+            if self.fail
+            else {"access_token": f"t{number}", "expires_in": self.expires_in}
+        )
+        yield _FakeResponse(json.dumps(result).encode())
+
+
+class _FakeResponse:
+    """A successful HTTP response with a fixed body."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize the response."""
+        self._body = body
+
+    def raise_for_status(self) -> None:
+        """Do nothing; the status is always 200."""
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._body
+
+
+def _manager(session: _FakeSession) -> TokenManager:
+    """Return a token manager using the fake session."""
+    return TokenManager("hub", "id", "secret", session)  # type: ignore[arg-type]
+
+
+def test_concurrent_callers_share_one_refresh() -> None:
+    """Many callers waiting on an expired token cause one request."""
+
+    async def run() -> None:
+        session = _FakeSession()
+        session.release.clear()
+        tokens = _manager(session)
+        waiters = [asyncio.create_task(tokens.get_token()) for _ in range(10)]
+        await asyncio.sleep(0)
+        session.release.set()
+        assert await asyncio.gather(*waiters) == ["t1"] * 10
+        assert session.requests == 1
+        assert await tokens.get_token() == "t1"
+        assert session.requests == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_the_refresh() -> None:
+    """The shared refresh outlives a caller that gives up on it."""
+
+    async def run() -> None:
+        session = _FakeSession()
+        session.release.clear()
+        tokens = _manager(session)
+        first = asyncio.create_task(tokens.get_token())
+        second = asyncio.create_task(tokens.get_token())
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        session.release.set()
+        assert await second == "t1"
+        assert first.cancelled()
+        assert session.requests == 1
+
+    asyncio.run(run())
+
+
+def test_failed_refresh_reaches_every_caller_and_is_retried() -> None:
+    """All waiters see the error; the next call makes a new request."""
+
+    async def run() -> None:
+        session = _FakeSession(fail=True)
+        tokens = _manager(session)
+        results = await asyncio.gather(
+            tokens.get_token(), tokens.get_token(), return_exceptions=True
+        )
+        assert all(isinstance(result, AuthenticationError) for result in results)
+        assert session.requests == 1
+        session.fail = False
+        assert await tokens.get_token() == "t2"
+
+    asyncio.run(run())
+
+
+def test_invalidate_forces_a_new_token() -> None:
+    """A discarded token is replaced on the next call."""
+
+    async def run() -> None:
+        tokens = _manager(_FakeSession())
+        assert await tokens.get_token() == "t1"
+        tokens.invalidate()
+        assert await tokens.get_token() == "t2"
+
+    asyncio.run(run())
+
+
+def test_token_is_renewed_in_the_background() -> None:
+    """A short-lived token is renewed halfway through its lifetime."""
+
+    async def run() -> None:
+        session = _FakeSession(expires_in=0.4)
+        tokens = _manager(session)
+        await tokens.get_token()
+        tokens.start()
+        await asyncio.sleep(0.3)
+        assert session.requests == 2
+        await tokens.stop()
+        await asyncio.sleep(0.3)
+        assert session.requests == 2
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_an_in_flight_refresh() -> None:
+    """Callers waiting on a refresh that is stopped are cancelled."""
+
+    async def run() -> None:
+        session = _FakeSession()
+        session.release.clear()
+        tokens = _manager(session)
+        waiter = asyncio.create_task(tokens.get_token())
+        await asyncio.sleep(0)
+        await tokens.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+"""Tests for the JSON codec and its standard-library fallback."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import importlib
+import sys
+from types import ModuleType
+
+import pytest
+
+from api import codec
+
+PAYLOAD = {"event": "THSensor.Report", "data": {"temperature": 21.5, "ok": True}}
+ENCODED = b'{"event":"THSensor.Report","data":{"temperature":21.5,"ok":true}}'
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request: pytest.FixtureRequest) -> Iterator[ModuleType]:
+    """Yield the codec module loaded with each backend."""
+    if request.param == "json":
+        saved = sys.modules.get("orjson")
+        # A None entry makes ``import orjson`` raise ImportError
+        sys.modules["orjson"] = None  # type: ignore[assignment]
+        try:
+            yield importlib.reload(codec)
+        finally:
+            if saved is None:
+                del sys.modules["orjson"]
+            else:
+                sys.modules["orjson"] = saved
+            importlib.reload(codec)
+    else:
+        pytest.importorskip("orjson")
+        yield codec
+
+
+def test_backend_is_reported(backend: ModuleType) -> None:
+    """``BACKEND`` names the library actually in use."""
+    assert backend.BACKEND in ("orjson", "json")
+    assert (backend.orjson is None) == (backend.BACKEND == "json")
+
+
+def test_dumps_is_compact_bytes(backend: ModuleType) -> None:
+    """Both backends produce the same compact encoding."""
+    assert backend.dumps(PAYLOAD) == ENCODED
+
+
+@pytest.mark.parametrize(
+    "data", [ENCODED, bytearray(ENCODED), memoryview(ENCODED), ENCODED.decode()]
+)
+def test_loads_accepts_bytes_and_text(backend: ModuleType, data: object) -> None:
+    """Payloads decode the same from every supported input type."""
+    assert backend.loads(data) == PAYLOAD
+
+
+def test_malformed_input_raises_decode_error(backend: ModuleType) -> None:
+    """Either backend's error is caught as ``JSONDecodeError``."""
+    with pytest.raises(backend.JSONDecodeError):
+        backend.loads(b'{"event": ')
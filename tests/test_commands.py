@@ -0,0 +1,150 @@
+"""Tests for optimistic command state and its rollback."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import tempfile
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.yolocal import coordinator as coordinator_module  # noqa: E402
+from custom_components.yolocal.api import Device, DeviceEvent  # noqa: E402
+from custom_components.yolocal.coordinator import YoLocalCoordinator  # noqa: E402
+
+LOCK = Device("lock1", "Front door", "tok", "Lock")
+CONFIRM_TIMEOUT = 0.05
+
+
+class _FakeClient:
+    """Answers commands with a fixed result, or fails them."""
+
+    def __init__(self, result: Any = None, error: Exception | None = None) -> None:
+        """Initialize the client."""
+        self.result = {} if result is None else result
+        self.error = error
+
+    async def set_state(self, device: Device, params: dict[str, Any]) -> Any:
+        """Answer a command."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def cancel_background(self) -> int:
+        """Drop nothing; no background requests are ever queued."""
+        return 0
+
+
+def _run(
+    client: _FakeClient,
+    test: Callable[[YoLocalCoordinator, list[None]], Awaitable[None]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Run ``test`` against a coordinator holding one unlocked lock."""
+    monkeypatch.setattr(
+        coordinator_module, "COMMAND_CONFIRM_TIMEOUT", CONFIRM_TIMEOUT
+    )
+
+    async def run() -> None:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            coordinator = YoLocalCoordinator(
+                hass, client, None, None, "net"  # type: ignore[arg-type]
+            )
+            coordinator._devices = {LOCK.device_id: LOCK}
+            coordinator._states = {LOCK.device_id: {"state": "unlocked"}}
+            updates: list[None] = []
+            coordinator.async_add_device_listener(
+                LOCK.device_id, lambda: updates.append(None)
+            )
+            await test(coordinator, updates)
+
+    asyncio.run(run())
+
+
+def test_unconfirmed_state_is_rolled_back_after_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Optimistic values nobody confirms revert once the timeout passes."""
+
+    async def test(coordinator: YoLocalCoordinator, updates: list[None]) -> None:
+        await coordinator.async_send_command(
+            LOCK.device_id, {"state": "lock"}, {"state": "locked", "user": "ha"}
+        )
+        assert coordinator.get_state(LOCK.device_id)["state"] == "locked"
+        await asyncio.sleep(CONFIRM_TIMEOUT * 3)
+        assert coordinator.get_state(LOCK.device_id) == {"state": "unlocked"}
+        assert coordinator.metrics.counters["commands_rolled_back"] == 1
+        assert len(updates) == 2
+
+    _run(_FakeClient(), test, monkeypatch)
+
+
+def test_failed_command_is_rolled_back_at_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A command that fails restores the previous state before raising."""
+
+    async def test(coordinator: YoLocalCoordinator, updates: list[None]) -> None:
+        with pytest.raises(TimeoutError):
+            await coordinator.async_send_command(
+                LOCK.device_id, {"state": "lock"}, {"state": "locked"}
+            )
+        assert coordinator.get_state(LOCK.device_id) == {"state": "unlocked"}
+        assert coordinator.metrics.counters["commands_rolled_back"] == 1
+
+    _run(_FakeClient(error=TimeoutError()), test, monkeypatch)
+
+
+def test_response_confirms_the_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fields in the command response settle it; nothing is rolled back."""
+
+    async def test(coordinator: YoLocalCoordinator, updates: list[None]) -> None:
+        await coordinator.async_send_command(
+            LOCK.device_id, {"state": "lock"}, {"state": "locked"}
+        )
+        await asyncio.sleep(CONFIRM_TIMEOUT * 3)
+        assert coordinator.get_state(LOCK.device_id)["state"] == "locked"
+        assert coordinator.metrics.counters["commands_confirmed"] == 1
+        assert "commands_rolled_back" not in coordinator.metrics.counters
+
+    _run(_FakeClient({"state": "locked"}), test, monkeypatch)
+
+
+def test_report_confirms_the_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A device report on the command's fields settles it."""
+
+    async def test(coordinator: YoLocalCoordinator, updates: list[None]) -> None:
+        await coordinator.async_send_command(
+            LOCK.device_id, {"state": "lock"}, {"state": "locked"}
+        )
+        coordinator._on_device_events(
+            [DeviceEvent(LOCK.device_id, "Lock.Report", {"state": "locked"})]
+        )
+        await asyncio.sleep(CONFIRM_TIMEOUT * 3)
+        assert coordinator.get_state(LOCK.device_id)["state"] == "locked"
+        assert coordinator.metrics.counters["commands_confirmed"] == 1
+
+    _run(_FakeClient(), test, monkeypatch)
+
+
+def test_rollback_keeps_values_the_device_reported(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only fields still holding the optimistic value are reverted."""
+
+    async def test(coordinator: YoLocalCoordinator, updates: list[None]) -> None:
+        await coordinator.async_send_command(
+            LOCK.device_id, {"state": "lock"}, {"state": "locked", "user": "ha"}
+        )
+        # The device changed its state some other way in the meantime
+        coordinator._states[LOCK.device_id] = {"state": "jammed", "user": "ha"}
+        await asyncio.sleep(CONFIRM_TIMEOUT * 3)
+        assert coordinator.get_state(LOCK.device_id) == {"state": "jammed"}
+
+    _run(_FakeClient(), test, monkeypatch)
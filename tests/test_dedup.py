@@ -0,0 +1,72 @@
+"""Tests for duplicate and out-of-order report suppression."""
+
+from __future__ import annotations
+
+from api.dedup import ReportFilter
+from api.metrics import Metrics
+
+
+def test_repeated_msgid_is_a_duplicate() -> None:
+    """The same message delivered twice is applied once."""
+    metrics = Metrics()
+    reports = ReportFilter(metrics=metrics)
+    assert reports.accept("a", "1", 1000)
+    assert not reports.accept("a", "1", 1000)
+    assert metrics.counters["events_duplicate"] == 1
+
+
+def test_older_report_is_dropped_however_old() -> None:
+    """Nothing older than the newest applied report gets through."""
+    metrics = Metrics()
+    reports = ReportFilter(metrics=metrics)
+    assert reports.accept("a", "3", 1_000_000)
+    assert not reports.accept("a", "2", 999_999)
+    assert not reports.accept("a", "1", 1_000_000 - 400_000)
+    assert metrics.counters["events_out_of_order"] == 2
+
+
+def test_same_timestamp_with_new_msgid_is_accepted() -> None:
+    """Two distinct reports in the same millisecond are both applied."""
+    reports = ReportFilter()
+    assert reports.accept("a", "1", 1000)
+    assert reports.accept("a", "2", 1000)
+
+
+def test_devices_are_tracked_separately() -> None:
+    """One device's history does not affect another's."""
+    reports = ReportFilter()
+    assert reports.accept("a", "1", 2000)
+    assert reports.accept("b", "1", 1000)
+
+
+def test_msgid_history_is_bounded() -> None:
+    """Only the most recent message IDs are remembered."""
+    reports = ReportFilter(history=2)
+    for msgid in ("1", "2", "3"):
+        assert reports.accept("a", msgid, None)
+    assert reports.accept("a", "1", None)
+    assert not reports.accept("a", "3", None)
+
+
+def test_reports_without_ids_are_accepted() -> None:
+    """Reports lacking a msgid and timestamp cannot be checked."""
+    reports = ReportFilter()
+    assert reports.accept("a", None, None)
+    assert reports.accept("a", None, None)
+
+
+def test_reset_allows_earlier_timestamps_but_keeps_msgids() -> None:
+    """After a reconnect the clock may restart; redeliveries still drop."""
+    reports = ReportFilter()
+    assert reports.accept("a", "9", 5000)
+    reports.reset(["a"])
+    assert reports.accept("a", "10", 10)
+    assert not reports.accept("a", "9", 5000)
+
+
+def test_forget_drops_all_history() -> None:
+    """A removed device starts from scratch if it comes back."""
+    reports = ReportFilter()
+    assert reports.accept("a", "1", 5000)
+    reports.forget("a")
+    assert reports.accept("a", "1", 10)
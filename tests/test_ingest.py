@@ -0,0 +1,88 @@
+"""Tests for the MQTT event queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from api.ingest import EventQueue
+from api.mqtt import DeviceEvent
+
+
+def _drain(
+    events: list[DeviceEvent], **kwargs: Any
+) -> tuple[list[DeviceEvent], EventQueue]:
+    """Put ``events`` on a queue and return what one drain delivers."""
+
+    async def run() -> tuple[list[DeviceEvent], EventQueue]:
+        delivered: list[DeviceEvent] = []
+        queue = EventQueue(asyncio.get_running_loop(), delivered.extend, **kwargs)
+        for event in events:
+            queue.put(event)
+        await asyncio.sleep(0)
+        return delivered, queue
+
+    return asyncio.run(run())
+
+
+def test_reports_are_coalesced_per_device() -> None:
+    """Several reports for one device arrive as one merged event."""
+    delivered, queue = _drain(
+        [
+            DeviceEvent("a", "THSensor.Report", {"state": {"temperature": 20}}),
+            DeviceEvent("b", "DoorSensor.Report", {"state": "open"}),
+            DeviceEvent("a", "THSensor.Report", {"humidity": 40}),
+            DeviceEvent("a", "THSensor.Report", {"temperature": 21}),
+        ]
+    )
+    assert [event.device_id for event in delivered] == ["a", "b"]
+    assert delivered[0].data == {"temperature": 21, "humidity": 40}
+    assert queue.metrics["batches"] == 1
+    assert queue.metrics["coalesce_ratio"] == 2.0
+
+
+def test_full_state_survives_coalescing() -> None:
+    """A report folded into a getState result is still a full state."""
+    delivered, _ = _drain(
+        [
+            DeviceEvent("a", "DoorSensor.getState", {"state": "closed", "battery": 4}),
+            DeviceEvent("a", "DoorSensor.Report", {"state": "open"}),
+        ]
+    )
+    assert delivered[0].event == "DoorSensor.getState"
+    assert delivered[0].data == {"state": "open", "battery": 4}
+
+
+def test_malformed_report_is_skipped_alone() -> None:
+    """A report with non-dict data does not cost the rest of the batch."""
+    delivered, queue = _drain(
+        [
+            DeviceEvent("a", "DoorSensor.Report", None),  # type: ignore[arg-type]
+            DeviceEvent("b", "DoorSensor.Report", {"state": "open"}),
+        ]
+    )
+    assert [event.device_id for event in delivered] == ["b"]
+    assert queue.metrics["rejected"] == 1
+
+
+def test_duplicates_are_dropped_before_coalescing() -> None:
+    """A late report cannot fold an old value over a newer one."""
+    delivered, queue = _drain(
+        [
+            DeviceEvent("a", "DoorSensor.Report", {"state": "open"}, None, "2", 2000),
+            DeviceEvent("a", "DoorSensor.Report", {"state": "closed"}, None, "1", 1000),
+            DeviceEvent("a", "DoorSensor.Report", {"state": "open"}, None, "2", 2000),
+        ]
+    )
+    assert delivered[0].data == {"state": "open"}
+    assert queue.metrics["rejected"] == 2
+
+
+def test_full_queue_drops_oldest() -> None:
+    """Beyond ``maxsize``, the oldest queued events are discarded."""
+    delivered, queue = _drain(
+        [DeviceEvent(f"d{index}", "X.Report", {}) for index in range(5)],
+        maxsize=3,
+    )
+    assert [event.device_id for event in delivered] == ["d2", "d3", "d4"]
+    assert queue.metrics["dropped"] == 2
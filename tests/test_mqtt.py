@@ -0,0 +1,67 @@
+"""Tests for the MQTT client's pre-decode filters."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from api.mqtt import YoLinkMQTTClient
+
+
+def _client(**kwargs: object) -> YoLinkMQTTClient:
+    """Return an unconnected client for net ``net``."""
+    return YoLinkMQTTClient("hub", "net", "client", "token", **kwargs)
+
+
+def _message(device_id: str, event: str = "DoorSensor.Report") -> SimpleNamespace:
+    """Return a message shaped like the ones paho hands to ``on_message``."""
+    return SimpleNamespace(
+        topic=f"ylsubnet/net/{device_id}/report",
+        payload=b'{"event":"%s","deviceId":"%s","data":{}}'
+        % (event.encode(), device_id.encode()),
+    )
+
+
+def test_everything_passes_without_filters() -> None:
+    """No allowlist and no ignored events means nothing is dropped."""
+    client = _client()
+    assert not client._is_filtered(_message("a"))
+
+
+def test_device_allowlist_uses_the_topic() -> None:
+    """Only devices on the allowlist get through."""
+    client = _client()
+    client.set_device_filter(["a"])
+    assert not client._is_filtered(_message("a"))
+    assert client._is_filtered(_message("b"))
+    client.set_device_filter(None)
+    assert not client._is_filtered(_message("b"))
+
+
+def test_ignored_events_are_dropped() -> None:
+    """The event name is matched in the raw payload."""
+    client = _client()
+    client.set_event_filter(["Outlet.setSchedules"])
+    assert client._is_filtered(_message("a", "Outlet.setSchedules"))
+    assert not client._is_filtered(_message("a", "Outlet.Report"))
+
+
+def test_last_heard_covers_ignored_events_only() -> None:
+    """Ignored events still show the device is alive; unknown devices don't."""
+    last_heard: dict[str, float] = {}
+    client = _client(last_heard=last_heard)
+    client.set_device_filter(["a"])
+    client.set_event_filter(["DoorSensor.setOpenRemind"])
+    assert client._is_filtered(_message("a", "DoorSensor.setOpenRemind"))
+    assert client._is_filtered(_message("b"))
+    assert list(last_heard) == ["a"]
+
+
+def test_filtered_messages_are_counted_and_not_queued() -> None:
+    """Dropped messages never reach the queue."""
+    queued: list[object] = []
+    client = _client(event_queue=SimpleNamespace(put=queued.append))
+    client.set_device_filter(["a"])
+    client._on_message(None, None, _message("b"))
+    client._on_message(None, None, _message("a"))
+    assert client.filtered_messages == 1
+    assert [event.device_id for event in queued] == ["a"]
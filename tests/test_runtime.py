@@ -0,0 +1,97 @@
+"""Tests for the runtime shared by all hubs."""
+
+from __future__ import annotations
+
+import asyncio
+
+from api.metrics import Metrics
+from api.mqtt import MQTT_TRANSPORT_ASYNCIO, DeviceEvent
+from api.runtime import SharedRuntime
+
+
+def _runtime() -> SharedRuntime:
+    """Return a runtime on a loop that is never run."""
+    return SharedRuntime(asyncio.new_event_loop())
+
+
+def _event(device_id: str) -> DeviceEvent:
+    """Return a report from a device."""
+    return DeviceEvent(device_id, "DoorSensor.Report", {"state": "open"})
+
+
+def test_runtime_stays_open_until_every_user_releases_it() -> None:
+    """Only the last release reports that the runtime can be closed."""
+    runtime = _runtime()
+    runtime.acquire("a")
+    runtime.acquire("b")
+    runtime.acquire("b")
+    assert not runtime.release("a")
+    assert not runtime.release("a")
+    assert runtime.release("b")
+
+
+def test_reports_are_routed_to_the_owning_hub() -> None:
+    """Each hub gets its own devices' reports; orphans are counted."""
+    runtime = _runtime()
+    got: dict[str, list[str]] = {"a": [], "b": []}
+    for hub_id in got:
+        runtime.add_hub(
+            hub_id,
+            lambda device_id, hub_id=hub_id: device_id.startswith(hub_id),
+            lambda events, hub_id=hub_id: got[hub_id].extend(
+                event.device_id for event in events
+            ),
+            Metrics(),
+        )
+    runtime._deliver([_event("a1"), _event("b1"), _event("c1"), _event("a2")])
+    assert got == {"a": ["a1", "a2"], "b": ["b1"]}
+    assert runtime.metrics.counters["events_unrouted"] == 1
+
+
+def test_single_hub_gets_the_whole_batch() -> None:
+    """With one hub there is nothing to route."""
+    runtime = _runtime()
+    got: list[DeviceEvent] = []
+    runtime.add_hub("a", lambda device_id: False, got.extend, Metrics())
+    events = [_event("a1"), _event("x")]
+    runtime._deliver(events)
+    assert got == events
+
+
+def test_failing_hub_does_not_stop_delivery() -> None:
+    """An error in one hub's callback is logged, not raised."""
+
+    def fail(events: list[DeviceEvent]) -> None:
+        raise RuntimeError
+
+    runtime = _runtime()
+    runtime.add_hub("a", lambda device_id: device_id == "a1", fail, Metrics())
+    runtime._deliver([_event("a1")])
+    got: list[DeviceEvent] = []
+    runtime.add_hub("b", lambda device_id: device_id == "b1", got.extend, Metrics())
+    runtime._deliver([_event("b1"), _event("a1")])
+    assert [event.device_id for event in got] == ["b1"]
+
+
+def test_removed_hub_is_forgotten() -> None:
+    """A removed hub is no longer listed."""
+    runtime = _runtime()
+    runtime.add_hub("a", lambda device_id: True, lambda events: None, Metrics())
+    runtime.add_hub("b", lambda device_id: False, lambda events: None, Metrics())
+    runtime.remove_hub("a")
+    assert runtime.hubs == ["b"]
+
+
+def test_hubs_share_an_unlimited_pool_and_the_asyncio_transport() -> None:
+    """Each hub's scheduler, not the pool, limits its requests."""
+
+    async def run() -> None:
+        runtime = SharedRuntime(asyncio.get_running_loop())
+        assert runtime.mqtt_transport == MQTT_TRANSPORT_ASYNCIO
+        session = runtime.session
+        assert runtime.session is session
+        assert session.connector.limit_per_host == 0
+        await runtime.close()
+        assert session.closed
+
+    asyncio.run(run())
@@ -0,0 +1,159 @@
+"""Tests for the request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from api.scheduler import Priority, RequestCancelled, RequestScheduler
+
+
+def test_waiters_are_served_by_priority_then_arrival() -> None:
+    """Queued requests get slots most urgent first, FIFO within a class."""
+
+    async def run() -> list[str]:
+        scheduler = RequestScheduler(1, reserved=0)
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def request(name: str, priority: Priority) -> None:
+            async with scheduler.slot(priority):
+                order.append(name)
+                await release.wait()
+
+        holder = asyncio.create_task(request("holder", Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(request(name, priority))
+            for name, priority in (
+                ("background", Priority.BACKGROUND),
+                ("targeted", Priority.TARGETED),
+                ("interactive-1", Priority.INTERACTIVE),
+                ("interactive-2", Priority.INTERACTIVE),
+            )
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queued == 4
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    assert asyncio.run(run()) == [
+        "holder",
+        "interactive-1",
+        "interactive-2",
+        "targeted",
+        "background",
+    ]
+
+
+def test_reserved_slot_is_kept_for_interactive_requests() -> None:
+    """Background work cannot take the last slot, commands can."""
+
+    async def run() -> None:
+        scheduler = RequestScheduler(2, reserved=1)
+        release = asyncio.Event()
+
+        async def request(priority: Priority) -> None:
+            async with scheduler.slot(priority):
+                await release.wait()
+
+        tasks = [asyncio.create_task(request(Priority.BACKGROUND)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 1
+        assert scheduler.queued == 1
+
+        command = asyncio.create_task(request(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 2
+        assert scheduler.queued == 1
+
+        release.set()
+        await asyncio.gather(command, *tasks)
+        assert scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_timeout_raises_and_leaves_slots_consistent() -> None:
+    """A request that waits too long fails without leaking a slot."""
+
+    async def run() -> None:
+        scheduler = RequestScheduler(1, reserved=0)
+        release = asyncio.Event()
+
+        async def holder() -> None:
+            async with scheduler.slot(Priority.BACKGROUND):
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            async with scheduler.slot(Priority.TARGETED, timeout=0.01):
+                pass
+        assert scheduler.queued == 0
+
+        release.set()
+        await task
+        assert scheduler.in_flight == 0
+        async with scheduler.slot(Priority.TARGETED, timeout=0.01):
+            assert scheduler.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_cancel_drops_background_requests_only() -> None:
+    """cancel() fails queued requests at or below the priority given."""
+
+    async def run() -> None:
+        scheduler = RequestScheduler(1, reserved=0)
+        release = asyncio.Event()
+
+        async def request(priority: Priority) -> None:
+            async with scheduler.slot(priority):
+                await release.wait()
+
+        holder = asyncio.create_task(request(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(request(Priority.BACKGROUND))
+        targeted = asyncio.create_task(request(Priority.TARGETED))
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel() == 1
+        with pytest.raises(RequestCancelled):
+            await background
+        assert scheduler.queued == 1
+
+        release.set()
+        await asyncio.gather(holder, targeted)
+        assert scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_releases_its_slot() -> None:
+    """A waiting task cancelled by its caller neither holds nor leaks a slot."""
+
+    async def run() -> None:
+        scheduler = RequestScheduler(1, reserved=0)
+        release = asyncio.Event()
+
+        async def request() -> None:
+            async with scheduler.slot(Priority.BACKGROUND):
+                await release.wait()
+
+        holder = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        release.set()
+        await holder
+        assert scheduler.in_flight == 0
+        assert scheduler.queued == 0
+
+    asyncio.run(run())
@@ -0,0 +1,78 @@
+"""Tests for restoring the on-disk device snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from typing import Any
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.yolocal.coordinator import YoLocalCoordinator  # noqa: E402
+
+DEVICE = {
+    "deviceId": "door1",
+    "name": "Back door",
+    "token": "tok",
+    "type": "DoorSensor",
+}
+
+
+class _FakeStore:
+    """Returns fixed snapshot contents."""
+
+    def __init__(self, snapshot: Any) -> None:
+        """Initialize the store."""
+        self.snapshot = snapshot
+
+    async def async_load(self) -> Any:
+        """Return the snapshot."""
+        return self.snapshot
+
+
+def _load(snapshot: Any) -> tuple[bool, YoLocalCoordinator]:
+    """Load ``snapshot`` into a fresh coordinator."""
+
+    async def run() -> tuple[bool, YoLocalCoordinator]:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            coordinator = YoLocalCoordinator(
+                hass, None, None, None, "net"  # type: ignore[arg-type]
+            )
+            coordinator._store = _FakeStore(snapshot)  # type: ignore[assignment]
+            return await coordinator._async_load_snapshot(), coordinator
+
+    return asyncio.run(run())
+
+
+def test_snapshot_restores_devices_and_flat_states() -> None:
+    """Devices and their normalized states come back from the snapshot."""
+    loaded, coordinator = _load(
+        {"devices": [DEVICE], "states": {"door1": {"state": {"state": "open"}}}}
+    )
+    assert loaded
+    assert list(coordinator.devices) == ["door1"]
+    assert coordinator.get_state("door1") == {"state": "open"}
+
+
+@pytest.mark.parametrize(
+    "snapshot",
+    [
+        None,
+        {"devices": []},
+        {"devices": [{"deviceId": "door1"}]},
+        {"devices": ["door1"]},
+        {"devices": [DEVICE], "states": {"door1": "open"}},
+        {"devices": [DEVICE], "states": ["door1"]},
+        ["door1"],
+    ],
+)
+def test_unusable_snapshot_means_a_cold_start(snapshot: Any) -> None:
+    """A missing, empty, corrupt or outdated snapshot is ignored."""
+    loaded, coordinator = _load(snapshot)
+    assert not loaded
+    assert coordinator.devices == {}
@@ -0,0 +1,75 @@
+"""Tests for stale device detection."""
+
+from __future__ import annotations
+
+from api.staleness import StalenessTracker
+
+
+def test_device_goes_stale_only_after_its_deadline() -> None:
+    """A silent device is stale once a full timeout has passed."""
+    last_heard: dict[str, float] = {}
+    tracker = StalenessTracker(last_heard)
+    tracker.track("a", 100.0, now=0.0)
+
+    assert tracker.check(99.0, listening_since=0.0) == ([], [])
+    assert tracker.check(100.0, listening_since=0.0) == (["a"], [])
+    assert tracker.is_stale("a")
+    # Reported once, not on every check
+    assert tracker.check(200.0, listening_since=0.0) == ([], [])
+
+
+def test_messages_push_the_deadline_back() -> None:
+    """A device heard from before its deadline is rescheduled, not expired."""
+    last_heard: dict[str, float] = {}
+    tracker = StalenessTracker(last_heard)
+    tracker.track("a", 100.0, now=0.0)
+    last_heard["a"] = 80.0
+
+    assert tracker.check(150.0, listening_since=0.0) == ([], [])
+    assert tracker.check(180.0, listening_since=0.0) == (["a"], [])
+
+
+def test_revive_clears_stale_device() -> None:
+    """A stale device that reports again is no longer stale."""
+    last_heard: dict[str, float] = {}
+    tracker = StalenessTracker(last_heard)
+    tracker.track("a", 100.0, now=0.0)
+    tracker.check(100.0, listening_since=0.0)
+
+    assert not tracker.revive("a")  # nothing heard yet
+    last_heard["a"] = 150.0
+    assert tracker.revive("a")
+    assert not tracker.is_stale("a")
+    assert tracker.check(249.0, listening_since=0.0) == ([], [])
+    assert tracker.check(250.0, listening_since=0.0) == (["a"], [])
+
+
+def test_check_reports_devices_heard_from_again() -> None:
+    """Devices heard from since going stale are returned as revived."""
+    last_heard: dict[str, float] = {}
+    tracker = StalenessTracker(last_heard)
+    tracker.track("a", 100.0, now=0.0)
+    tracker.check(100.0, listening_since=0.0)
+    last_heard["a"] = 120.0
+
+    assert tracker.check(130.0, listening_since=0.0) == ([], ["a"])
+    assert tracker.stale == frozenset()
+
+
+def test_nothing_goes_stale_while_disconnected_or_just_reconnected() -> None:
+    """Silence during an outage, or right after it, does not count."""
+    last_heard: dict[str, float] = {}
+    tracker = StalenessTracker(last_heard)
+    tracker.track("a", 100.0, now=0.0)
+
+    assert tracker.check(500.0, listening_since=None) == ([], [])
+    assert tracker.check(550.0, listening_since=500.0) == ([], [])
+    assert tracker.check(600.0, listening_since=500.0) == (["a"], [])
+
+
+def test_untracked_device_never_expires() -> None:
+    """A removed device leaves no deadline behind."""
+    tracker = StalenessTracker({})
+    tracker.track("a", 100.0, now=0.0)
+    tracker.untrack("a")
+    assert tracker.check(1000.0, listening_since=0.0) == ([], [])
@@ -0,0 +1,64 @@
+"""Tests for merging device reports into cached state."""
+
+from __future__ import annotations
+
+import pytest
+
+from api.state import merge_state, normalize_state
+
+
+def test_normalize_lifts_nested_state_and_drops_metadata() -> None:
+    """getState results are flattened and hub metadata is dropped."""
+    data = {
+        "online": True,
+        "state": {"temperature": 21.5, "battery": 4},
+        "deviceId": "d1",
+        "loraInfo": {"signal": -60},
+    }
+    assert normalize_state(data) == {
+        "online": True,
+        "temperature": 21.5,
+        "battery": 4,
+    }
+
+
+def test_normalize_keeps_non_dict_state_field() -> None:
+    """A string ``state`` (e.g. a door's "open") is a value, not a nesting."""
+    assert normalize_state({"state": "open"}) == {"state": "open"}
+
+
+def test_normalize_rejects_non_dict() -> None:
+    """Malformed data raises rather than being taken for an empty state."""
+    with pytest.raises(TypeError):
+        normalize_state(None)  # type: ignore[arg-type]
+
+
+def test_merge_report_keeps_fields_it_omits() -> None:
+    """A partial report only changes the fields it carries."""
+    current = {"state": "closed", "battery": 4}
+    state, changed = merge_state(current, "DoorSensor.Report", {"state": "open"})
+    assert state == {"state": "open", "battery": 4}
+    assert changed == {"state"}
+    assert current == {"state": "closed", "battery": 4}
+
+
+def test_merge_unchanged_report_changes_nothing() -> None:
+    """A report repeating the cached values reports no changed fields."""
+    current = {"state": "closed", "battery": 4}
+    _, changed = merge_state(current, "DoorSensor.Report", {"state": "closed"})
+    assert changed == frozenset()
+
+
+def test_merge_get_state_replaces_and_reports_removed_fields() -> None:
+    """A full state replaces the cache; fields it lacks count as changed."""
+    current = {"state": "closed", "alertType": "normal"}
+    state, changed = merge_state(current, "DoorSensor.getState", {"state": "closed"})
+    assert state == {"state": "closed"}
+    assert changed == {"alertType"}
+
+
+def test_merge_into_empty_state() -> None:
+    """The first report for a device becomes its whole state."""
+    state, changed = merge_state({}, "THSensor.Report", {"state": {"humidity": 40}})
+    assert state == {"humidity": 40}
+    assert changed == {"humidity"}
@@ -0,0 +1,71 @@
+"""Tests for telemetry throttling."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from api.throttle import FieldThrottle, ReportThrottle
+
+THROTTLES = {
+    "THSensor": {
+        "temperature": FieldThrottle(deadband=0.1, min_interval=60.0, max_silence=900.0)
+    }
+}
+
+
+def _throttle(temperature: float = 20.0, at: float = 0.0) -> ReportThrottle:
+    """Return a throttle that last published ``temperature`` at ``at``."""
+    throttle = ReportThrottle(THROTTLES)
+    throttle.published("THSensor", "a", {"temperature": temperature}, at)
+    return throttle
+
+
+def _due(throttle: ReportThrottle, state: dict[str, Any], now: float) -> float | None:
+    """Return when a change of every field in ``state`` is due."""
+    return throttle.due("THSensor", "a", state, state.keys(), now)
+
+
+def test_change_within_deadband_waits_for_max_silence() -> None:
+    """A small change is only published after the maximum silence."""
+    assert _due(_throttle(), {"temperature": 20.05}, 100.0) == 900.0
+
+
+def test_change_beyond_deadband_waits_for_min_interval() -> None:
+    """A significant change is published, but no sooner than the interval."""
+    assert _due(_throttle(), {"temperature": 20.1}, 10.0) == 60.0
+    assert _due(_throttle(), {"temperature": 20.1}, 100.0) <= 100.0
+
+
+def test_deadband_compares_against_published_value() -> None:
+    """Drift adds up: steps below the deadband count once they sum to it."""
+    throttle = _throttle(20.1)
+    assert _due(throttle, {"temperature": 20.15}, 100.0) == 900.0
+    # 20.2 - 20.1 is just below 0.1 in floating point
+    assert _due(throttle, {"temperature": 20.2}, 100.0) <= 100.0
+
+
+def test_unthrottled_field_is_published_immediately() -> None:
+    """A change to any field without a throttle goes out at once."""
+    throttle = _throttle()
+    state = {"temperature": 20.0, "battery": 3}
+    assert throttle.due("THSensor", "a", state, ["battery"], 10.0) == 10.0
+
+
+def test_unknown_types_and_unpublished_devices_are_not_throttled() -> None:
+    """Only devices with throttles and a published baseline are held back."""
+    throttle = ReportThrottle(THROTTLES)
+    state = {"temperature": 20.05}
+    assert throttle.due("THSensor", "a", state, ["temperature"], 5.0) == 5.0
+    assert throttle.due("Outlet", "b", {"state": "open"}, ["state"], 5.0) == 5.0
+
+
+def test_non_numeric_values_compare_by_equality() -> None:
+    """A value becoming unavailable is always significant."""
+    assert _due(_throttle(), {"temperature": None}, 100.0) <= 100.0
+
+
+def test_forget_drops_baseline() -> None:
+    """A forgotten device is published immediately again."""
+    throttle = _throttle()
+    throttle.forget("a")
+    assert _due(throttle, {"temperature": 20.01}, 10.0) == 10.0